@@ -0,0 +1,187 @@
+# airport_index.py
+"""
+Offline lookup over the airports.min.json dataset (see build_airports_min.py).
+
+Exact matches are dict lookups; prefix matches use sorted key lists and
+bisect, so both answer in microseconds without touching the network.
+"""
+
+import json
+import math
+import os
+import unicodedata
+from bisect import bisect_left
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "airports.min.json")
+# a city name whose airports spread wider than this (around the main one) is
+# ambiguous (Portland OR/ME, Springfield, ...) and is left to the online geocoder
+CITY_SPREAD_KM = 50.0
+EARTH_RADIUS_KM = 6371.0088
+
+
+def normalize_city(name: str) -> str:
+    """Casefold, strip accents and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.casefold().split())
+
+
+def airport_rank(ap: dict) -> float:
+    """0..1 prior: scheduled service (IATA code) and a real ICAO ident."""
+    icao = ap.get("icao") or ""
+    return (2.0 * bool(ap.get("iata")) + (len(icao) == 4 and icao.isalpha())) / 3.0
+
+
+def distance_km(lat1, lon1, lat2, lon2) -> float:
+    """Great-circle (haversine) distance between two points."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    h = (math.sin((p2 - p1) / 2) ** 2
+         + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+class AirportIndex:
+    def __init__(self, airports: list):
+        self.airports = airports
+        self.by_icao = {}
+        self.by_iata = {}
+        self.by_city = {}   # normalized city -> [airport, ...]
+
+        for ap in airports:
+            icao = (ap.get("icao") or "").upper()
+            iata = (ap.get("iata") or "").upper()
+            city = normalize_city(ap.get("city") or "")
+            if icao:
+                self.by_icao.setdefault(icao, ap)
+            if iata:
+                self.by_iata.setdefault(iata, ap)
+            if city:
+                self.by_city.setdefault(city, []).append(ap)
+
+        # sorted keys for prefix search
+        self._icao_keys = sorted(self.by_icao)
+        self._iata_keys = sorted(self.by_iata)
+        self._city_keys = sorted(self.by_city)
+        self._city_coords = {}
+
+    @classmethod
+    def from_json(cls, path: str = DEFAULT_PATH) -> "AirportIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.airports)
+
+    # -------------------------
+    # Exact lookups
+    # -------------------------
+    def by_code(self, code: str):
+        """Airport for an ICAO or IATA code (ICAO wins), or None."""
+        code = (code or "").strip().upper()
+        return self.by_icao.get(code) or self.by_iata.get(code)
+
+    def city_coordinates(self, city_name: str):
+        """
+        (lat, lon) for a city name, or None.
+
+        The position is the city's main airport (scheduled service first,
+        see airport_rank; ties by ICAO code). If any other airport with the
+        name lies more than CITY_SPREAD_KM from it, the name is ambiguous
+        and None is returned so callers fall back to a real geocoder.
+        """
+        key = normalize_city(city_name)
+        if key in self._city_coords:
+            return self._city_coords[key]
+
+        airports = self.by_city.get(key)
+        if not airports:
+            return None
+
+        main = min(airports, key=lambda ap: (-airport_rank(ap), ap.get("icao") or ""))
+        spread = max(distance_km(main["lat"], main["lon"], ap["lat"], ap["lon"]) for ap in airports)
+        coords = (main["lat"], main["lon"]) if spread <= CITY_SPREAD_KM else None
+        self._city_coords[key] = coords
+        return coords
+
+    def all_city_coordinates(self) -> dict:
+        """normalized city name -> (lat, lon) for every unambiguous city in the dataset."""
+        coords = {key: self.city_coordinates(key) for key in self._city_keys}
+        return {key: c for key, c in coords.items() if c is not None}
+
+    def resolve(self, query: str):
+        """
+        Geocode a free-text query offline: (lat, lon) or None.
+
+        A 3–4 character upper-case query is tried as an ICAO/IATA code first
+        ("LAX"); anything else is tried as a city name first ("Rome").
+        """
+        query = (query or "").strip()
+        if not query:
+            return None
+
+        looks_like_code = 3 <= len(query) <= 4 and query.isalnum() and query.isupper()
+        lookups = (self._code_coordinates, self.city_coordinates)
+        if not looks_like_code:
+            lookups = lookups[::-1]
+
+        for lookup in lookups:
+            coords = lookup(query)
+            if coords is not None:
+                return coords
+        return None
+
+    def _code_coordinates(self, code: str):
+        ap = self.by_code(code)
+        return (ap["lat"], ap["lon"]) if ap else None
+
+    # -------------------------
+    # Prefix lookups
+    # -------------------------
+    @staticmethod
+    def _prefix_keys(keys: list, prefix: str, limit: int):
+        out = []
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and len(out) < limit and keys[i].startswith(prefix):
+            out.append(keys[i])
+            i += 1
+        return out
+
+    def prefix(self, query: str, limit: int = 10) -> list:
+        """
+        Airports whose ICAO, IATA or city starts with `query`.
+        Code matches come first, then city matches.
+        """
+        code = (query or "").strip().upper()
+        city = normalize_city(query)
+        if not code:
+            return []
+
+        results = []
+        seen = set()
+
+        def add(ap):
+            if id(ap) not in seen:
+                seen.add(id(ap))
+                results.append(ap)
+
+        for key in self._prefix_keys(self._iata_keys, code, limit):
+            add(self.by_iata[key])
+        for key in self._prefix_keys(self._icao_keys, code, limit):
+            add(self.by_icao[key])
+        for key in self._prefix_keys(self._city_keys, city, limit):
+            for ap in self.by_city[key]:
+                add(ap)
+                if len(results) >= limit:
+                    break
+            if len(results) >= limit:
+                break
+
+        return results[:limit]
+
+
+def load_airport_index(path: str = DEFAULT_PATH) -> AirportIndex:
+    """Index for `path`, or an empty index if the dataset has not been built."""
+    if not os.path.exists(path):
+        return AirportIndex([])
+    return AirportIndex.from_json(path)
@@ -1,9 +1,20 @@
+import argparse
 import csv
-import json
+import glob
+import hashlib
 import io
-import requests
+import json
+import os
+import tempfile
+
+import numpy as np
+
+import http_client
 
 URL = "https://raw.githubusercontent.com/davidmegginson/ourairports-data/main/airports.csv"
+OUTPUT = "airports.min.json"
+MANIFEST = "airports.manifest.json"
+
 
 def safe_float(x):
     try:
@@ -11,28 +22,24 @@ def safe_float(x):
     except Exception:
         return None
 
-r = requests.get(URL, timeout=60)
-r.raise_for_status()
-
-out = []
-reader = csv.DictReader(io.StringIO(r.text))
 
-for row in reader:
+def airport_record(row):
+    """Map one OurAirports CSV row to the compact record, or None to skip it."""
     ident = (row.get("ident") or "").strip().upper()
     if len(ident) < 3:
-        continue
+        return None
 
     lat = safe_float((row.get("latitude_deg") or "").strip())
     lon = safe_float((row.get("longitude_deg") or "").strip())
     if lat is None or lon is None:
-        continue
+        return None
 
     # OPTIONAL: reduce file size by excluding closed airports
     # comment these 2 lines out if you want literally everything
     if (row.get("type") or "").strip().lower() == "closed":
-        continue
+        return None
 
-    out.append({
+    return {
         "icao": ident,
         "iata": ((row.get("iata_code") or "").strip().upper() or None),
         "name": (row.get("name") or "").strip(),
@@ -40,9 +47,253 @@ for row in reader:
         "country": (row.get("iso_country") or "").strip().upper(),
         "lat": lat,
         "lon": lon,
-    })
+    }
+
+
+def iter_airports(text_stream):
+    """Parse CSV rows as they arrive and yield compact airport records."""
+    for row in csv.DictReader(text_stream):
+        rec = airport_record(row)
+        if rec is not None:
+            yield rec
+
+
+# -------------------------
+# Source state (ETag / Last-Modified / local file stamp)
+# -------------------------
+def meta_path(output):
+    return output + ".meta.json"
+
+
+def load_meta(output):
+    try:
+        with open(meta_path(output), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_meta(output, meta):
+    with open(meta_path(output), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def manifest_path(output):
+    return os.path.join(os.path.dirname(os.path.abspath(output)), MANIFEST)
+
+
+def local_stamp(path):
+    st = os.stat(path)
+    return {"source": os.path.abspath(path), "size": st.st_size, "mtime": st.st_mtime}
+
+
+# -------------------------
+# Incremental writer
+# -------------------------
+def write_json_array(records, output):
+    """
+    Stream records into `output` as one compact JSON array, writing each
+    record as it is parsed. The file is swapped in atomically at the end.
+    """
+    tmp = output + ".tmp"
+    count = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("[")
+        for rec in records:
+            if count:
+                f.write(",")
+            f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+            count += 1
+        f.write("]")
+    os.replace(tmp, output)
+    return count
+
+
+# -------------------------
+# Columnar artifact
+# -------------------------
+# airports.<hash>.bin layout (all little-endian):
+#   b"APT1" | uint32 header length | JSON header (space-padded to 4 bytes)
+#   | int32 lat[n] | int32 lon[n]      (degrees * 1e5, ~1 m)
+#   | uint32 city[n] | uint16 country[n] (indexes into the header string tables)
+# The header holds n, the "\n"-joined icao / iata / name columns and the
+# distinct city and country strings. Grouping columns like this gzips/brotlis
+# far better than an array of objects that repeats every key.
+COLUMNAR_MAGIC = b"APT1"
+COORD_SCALE = 1e5
+FLUSH_EVERY = 4096   # records buffered per numeric column before it is flushed
+
+
+class ColumnarAirports:
+    """
+    Streams records column by column into temporary files while they pass,
+    so memory stays bounded by the distinct city/country tables; write()
+    joins the column files into the .bin.
+    """
+
+    TEXT_COLUMNS = ("icao", "iata", "name")
+    NUMERIC_COLUMNS = (("lat", "<i4"), ("lon", "<i4"), ("city", "<u4"), ("country", "<u2"))
+
+    def __init__(self):
+        self.count = 0
+        self.cities, self.countries = {}, {}
+        self._files = {name: tempfile.TemporaryFile() for name in self.TEXT_COLUMNS}
+        self._files.update((name, tempfile.TemporaryFile()) for name, _ in self.NUMERIC_COLUMNS)
+        self._pending = {name: [] for name, _ in self.NUMERIC_COLUMNS}
+
+    def collect(self, records):
+        for rec in records:
+            values = {
+                "icao": rec["icao"],
+                "iata": rec["iata"] or "",
+                "name": " ".join(rec["name"].split()),   # no embedded newlines
+            }
+            for name, value in values.items():
+                # each column is one JSON string: escaped values joined by "\n"
+                sep = "\\n" if self.count else ""
+                self._files[name].write((sep + json.dumps(value, ensure_ascii=False)[1:-1]).encode("utf-8"))
+
+            self._pending["lat"].append(rec["lat"])
+            self._pending["lon"].append(rec["lon"])
+            self._pending["city"].append(self.cities.setdefault(rec["city"], len(self.cities)))
+            self._pending["country"].append(self.countries.setdefault(rec["country"], len(self.countries)))
+            self.count += 1
+            if len(self._pending["lat"]) >= FLUSH_EVERY:
+                self._flush()
+            yield rec
+        self._flush()
+
+    def _flush(self):
+        for name, dtype in self.NUMERIC_COLUMNS:
+            values = np.array(self._pending[name])
+            if name in ("lat", "lon"):
+                values = np.round(values * COORD_SCALE)
+            self._files[name].write(values.astype(dtype).tobytes())
+            self._pending[name].clear()
+
+    def _chunks(self):
+        """The artifact as a sequence of byte strings / open column files."""
+        def dumps(value):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+        header = [
+            f'{{"n":{self.count},"icao":"'.encode("utf-8"), self._files["icao"],
+            b'","iata":"', self._files["iata"],
+            b'","name":"', self._files["name"],
+            f'","cities":{dumps(list(self.cities))},"countries":{dumps(list(self.countries))}}}'.encode("utf-8"),
+        ]
+        header_len = sum(len(part) if isinstance(part, bytes) else part.tell() for part in header)
+        padding = b" " * (-header_len % 4)   # typed arrays must start 4-byte aligned
+
+        return [
+            COLUMNAR_MAGIC,
+            np.uint32(header_len + len(padding)).astype("<u4").tobytes(),
+            *header,
+            padding,
+            *(self._files[name] for name, _ in self.NUMERIC_COLUMNS),
+        ]
+
+    def write(self, output):
+        """
+        Write airports.<content hash>.bin next to `output` plus the small
+        manifest that points to it; older hashed files are removed.
+        Returns the artifact filename.
+        """
+        folder = os.path.dirname(os.path.abspath(output))
+        tmp = os.path.join(folder, "airports.bin.tmp")
+        sha = hashlib.sha256()
+        try:
+            with open(tmp, "wb") as f:
+                for part in self._chunks():
+                    if isinstance(part, bytes):
+                        sha.update(part)
+                        f.write(part)
+                        continue
+                    part.seek(0)
+                    for block in iter(lambda: part.read(1 << 20), b""):
+                        sha.update(block)
+                        f.write(block)
+        finally:
+            self.close()
+
+        digest = sha.hexdigest()
+        filename = f"airports.{digest[:12]}.bin"
+        os.replace(tmp, os.path.join(folder, filename))
+        for old in glob.glob(os.path.join(folder, "airports.*.bin")):
+            if os.path.basename(old) != filename:
+                os.remove(old)
+
+        with open(manifest_path(output), "w", encoding="utf-8") as f:
+            json.dump({
+                "json": os.path.basename(output),
+                "columnar": filename,
+                "count": self.count,
+                "sha256": digest,
+            }, f, indent=2)
+        return filename
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+def build(source=URL, output=OUTPUT, force=False):
+    """
+    Rebuild `output` (and the columnar artifact) from a URL or a local CSV path.
+
+    Returns the number of airports written, or None when the source is
+    unchanged since the last build (no download, no parse).
+    """
+    have_output = os.path.exists(output) and os.path.exists(manifest_path(output))
+    previous = load_meta(output) if have_output and not force else {}
+
+    if os.path.exists(source):
+        stamp = local_stamp(source)
+        if previous == stamp:
+            return None
+        columns = ColumnarAirports()
+        with open(source, encoding="utf-8", newline="") as f:
+            count = write_json_array(columns.collect(iter_airports(f)), output)
+        columns.write(output)
+        save_meta(output, stamp)
+        return count
+
+    headers = {}
+    if previous.get("source") == source:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    with http_client.get(source, endpoint="dataset", headers=headers, stream=True) as r:
+        if r.status_code == 304:
+            return None
+        r.raise_for_status()
+
+        r.raw.decode_content = True   # undo gzip transfer encoding on the fly
+        r.raw.auto_close = False      # let TextIOWrapper see EOF instead of a closed file
+        text = io.TextIOWrapper(r.raw, encoding="utf-8", newline="")
+        columns = ColumnarAirports()
+        count = write_json_array(columns.collect(iter_airports(text)), output)
+        columns.write(output)
+
+        save_meta(output, {
+            "source": source,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        })
+    return count
+
 
-with open("airports.min.json", "w", encoding="utf-8") as f:
-    json.dump(out, f, ensure_ascii=False, separators=(",", ":"))
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build airports.min.json from OurAirports.")
+    parser.add_argument("--source", default=URL, help="airports.csv URL or local path")
+    parser.add_argument("-o", "--output", default=OUTPUT)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the source is unchanged")
+    args = parser.parse_args()
 
-print(f"Wrote {len(out)} airports to airports.min.json")
+    written = build(args.source, args.output, args.force)
+    if written is None:
+        print(f"{args.source} unchanged; kept {args.output}")
+    else:
+        print(f"Wrote {written} airports to {args.output}")
@@ -0,0 +1,117 @@
+# chat_history.py
+"""
+Token-budgeted conversation history for the AI assistant.
+
+Recent turns are kept verbatim in a sliding window. When a request would
+exceed the token budget, the oldest turns leave the window and are folded
+into a rolling summary (itself capped), so the payload stays flat however
+long the session runs.
+
+Token counts are estimated (~4 characters per token plus a small
+per-message overhead), which is close enough for budgeting without a
+model-specific tokenizer.
+"""
+
+import math
+import re
+
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+DEFAULT_BUDGET_TOKENS = 3000
+DEFAULT_SUMMARY_TOKENS = 400
+SUMMARY_LINE_CHARS = 200
+
+SUMMARY_HEADER = "Summary of the earlier conversation (oldest first):\n"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def message_tokens(role: str, content: str) -> int:
+    return estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _first_sentence(text: str, limit: int = SUMMARY_LINE_CHARS) -> str:
+    text = " ".join((text or "").split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    sentence = match.group(1) if match else text
+    return sentence if len(sentence) <= limit else sentence[:limit - 1] + "…"
+
+
+def extractive_summary(summary: str, dropped: list, max_tokens: int) -> str:
+    """
+    Default summarizer: one line per dropped message (its first sentence),
+    appended to the existing summary; the oldest lines go first when the
+    summary exceeds max_tokens. Local and free, unlike an LLM call per turn.
+    """
+    lines = [line for line in summary.splitlines() if line]
+    lines += [f"- {role}: {_first_sentence(content)}" for role, content in dropped]
+    while lines and estimate_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class ChatHistory:
+    def __init__(self, budget_tokens: int = DEFAULT_BUDGET_TOKENS,
+                 summary_tokens: int = DEFAULT_SUMMARY_TOKENS, summarize=None):
+        """
+        summarize(summary, dropped_messages, max_tokens) -> new summary;
+        defaults to extractive_summary.
+        """
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self.summarize = summarize or extractive_summary
+        self.window = []          # recent (role, content) pairs, verbatim
+        self.summary = ""
+        self.summarized_messages = 0
+
+    def append(self, role: str, content: str):
+        self.window.append((role, content))
+
+    def _payload_tokens(self, system_prompt: str) -> int:
+        total = message_tokens("system", system_prompt)
+        if self.summary:
+            total += message_tokens("system", SUMMARY_HEADER + self.summary)
+        return total + sum(message_tokens(r, c) for r, c in self.window)
+
+    def _evict(self, system_prompt: str):
+        """Fold the oldest turns into the summary until the payload fits."""
+        dropped = []
+        while len(self.window) > 1 and self._payload_tokens(system_prompt) > self.budget_tokens:
+            dropped.append(self.window.pop(0))
+            # keep user/assistant pairs together
+            if self.window and self.window[0][0] == "assistant" and len(self.window) > 1:
+                dropped.append(self.window.pop(0))
+            self.summary = self.summarize(self.summary, dropped, self.summary_tokens)
+            self.summarized_messages += len(dropped)
+            dropped = []
+
+    def messages(self, system_prompt: str) -> list:
+        """
+        Chat-completions messages for the next request, within the budget.
+        The newest message is always sent; if it alone exceeds the budget
+        its start is cut.
+        """
+        self._evict(system_prompt)
+
+        out = [{"role": "system", "content": system_prompt}]
+        if self.summary:
+            out.append({"role": "system", "content": SUMMARY_HEADER + self.summary})
+        out += [{"role": r, "content": c} for r, c in self.window]
+
+        over = self._payload_tokens(system_prompt) - self.budget_tokens
+        if over > 0 and self.window:
+            last = out[-1]["content"]
+            out[-1]["content"] = "…" + last[over * CHARS_PER_TOKEN + 1:]
+        return out
+
+    def stats(self, system_prompt: str = "") -> dict:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "payload_tokens": self._payload_tokens(system_prompt),
+            "window_messages": len(self.window),
+            "summarized_messages": self.summarized_messages,
+            "summary_tokens": estimate_tokens(self.summary),
+        }
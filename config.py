@@ -1,2 +1,14 @@
 import streamlit as st
 BACKEND_URL = st.secrets.get("BACKEND_URL", "http://127.0.0.1:8000")
+
+# "local" runs ISA / Mach physics in-process (see physics.py),
+# "remote" sends every calculation to BACKEND_URL.
+ENGINE_MODE = st.secrets.get("ENGINE_MODE", "local")
+
+# Token budget per AI assistant request (system prompt + summary + recent turns)
+AI_HISTORY_TOKEN_BUDGET = int(st.secrets.get("AI_HISTORY_TOKEN_BUDGET", 3000))
+
+# AI answer cache: exact matches only unless an embedding model is set
+# (similarity tier; needs OPENAI_API_KEY, threshold >= 0.93).
+AI_CACHE_EMBEDDING_MODEL = st.secrets.get("AI_CACHE_EMBEDDING_MODEL", "")
+AI_CACHE_THRESHOLD = float(st.secrets.get("AI_CACHE_THRESHOLD", 0.95))
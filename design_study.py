@@ -0,0 +1,204 @@
+# design_study.py
+"""
+Design-of-experiments runner for the ISA Designer inputs.
+
+Design points (MTOW, span, area, cruise speed, ...) are generated as a
+full-factorial grid or a Latin hypercube, evaluated in chunks on a process
+pool with the same cruise aerodynamics the designer page shows, and written
+to a columnar file (.parquet or .npz). pareto_front() marks the
+non-dominated designs for any pair of objectives.
+"""
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils import isa_atmosphere_array
+
+
+DEFAULT_CHUNK = 100_000
+
+# designer inputs (designer page units) and their default when not varied
+INPUT_DEFAULTS = {
+    "mtow_lb": 55.0,
+    "wing_span_ft": 18.0,
+    "wing_area_ft2": 24.0,
+    "taper_ratio": 0.55,
+    "cl_max": 1.6,
+    "cd0": 0.03,
+    "oswald_e": 0.8,
+    "cruise_speed_kt": 55.0,
+    "altitude_ft": 8000.0,
+}
+
+# objective -> True if larger is better
+OBJECTIVES = {
+    "ld": True,
+    "drag_lbf": False,
+    "power_required_hp": False,
+    "v_stall_kt": False,
+    "wing_loading_psf": False,
+    "aspect_ratio": True,
+}
+
+
+# -------------------------
+# Design generation
+# -------------------------
+def full_factorial(levels: dict) -> pd.DataFrame:
+    """Every combination of the given levels, e.g. {"mtow_lb": [40, 50, 60], ...}."""
+    names = list(levels)
+    grid = np.array(list(itertools.product(*(np.asarray(levels[n], dtype=float) for n in names))))
+    return pd.DataFrame(grid, columns=names)
+
+
+def latin_hypercube(bounds: dict, n: int, seed: int = 0) -> pd.DataFrame:
+    """n designs spread over {name: (lo, hi)}, one sample per stratum per input."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (lo, hi) in bounds.items():
+        u = (rng.permutation(n) + rng.uniform(size=n)) / n
+        columns[name] = lo + u * (hi - lo)
+    return pd.DataFrame(columns)
+
+
+# -------------------------
+# Evaluation
+# -------------------------
+def evaluate(designs: dict) -> dict:
+    """
+    Cruise aerodynamics for arrays of designs (missing inputs use
+    INPUT_DEFAULTS). Returns input and output columns as arrays.
+    """
+    cols = {k: np.asarray(designs.get(k, v), dtype=float) for k, v in INPUT_DEFAULTS.items()}
+    n = max(np.size(v) for v in cols.values())
+    cols = {k: np.broadcast_to(v, (n,)) for k, v in cols.items()}
+
+    W = cols["mtow_lb"] * 4.44822
+    S = cols["wing_area_ft2"] * 0.092903
+    b = cols["wing_span_ft"] * 0.3048
+    V = cols["cruise_speed_kt"] * 0.514444
+    taper = cols["taper_ratio"]
+    rho = isa_atmosphere_array(cols["altitude_ft"] * 0.3048)[2]
+
+    AR = b ** 2 / S
+    root_chord_ft = 2.0 * cols["wing_area_ft2"] / (cols["wing_span_ft"] * (1.0 + taper))
+    mac_ft = 2.0 / 3.0 * root_chord_ft * (1.0 + taper + taper ** 2) / (1.0 + taper)
+
+    q = 0.5 * rho * V ** 2
+    CL = W / (q * S)
+    CD = cols["cd0"] + CL ** 2 / (np.pi * cols["oswald_e"] * AR)
+    D = q * S * CD
+    v_stall = np.sqrt(2.0 * W / (rho * S * cols["cl_max"]))
+
+    return {
+        **cols,
+        "aspect_ratio": AR,
+        "mac_ft": mac_ft,
+        "wing_loading_psf": cols["mtow_lb"] / cols["wing_area_ft2"],
+        "cl": CL,
+        "cd": CD,
+        "ld": CL / CD,
+        "drag_lbf": D / 4.44822,
+        "power_required_hp": D * V / 745.7,
+        "v_stall_kt": v_stall / 0.514444,
+        "feasible": CL <= cols["cl_max"],
+    }
+
+
+def _evaluate_chunk(chunk: dict) -> dict:
+    return evaluate(chunk)
+
+
+def run_study(designs: pd.DataFrame, workers=None, chunk_size: int = DEFAULT_CHUNK) -> pd.DataFrame:
+    """
+    Evaluate every row of `designs`. Chunks go to a process pool; results
+    come back in input order. workers=1 (or a single chunk) stays in-process.
+    """
+    chunks = [
+        {k: v.to_numpy() for k, v in designs.iloc[i:i + chunk_size].items()}
+        for i in range(0, len(designs), chunk_size)
+    ]
+    if workers == 1 or len(chunks) <= 1:
+        parts = [_evaluate_chunk(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            parts = list(pool.map(_evaluate_chunk, chunks))
+
+    return pd.concat([pd.DataFrame(p) for p in parts], ignore_index=True)
+
+
+def pareto_front(results: pd.DataFrame, objectives: list, feasible_only: bool = True) -> np.ndarray:
+    """
+    Boolean mask of non-dominated rows for the given OBJECTIVES names.
+
+    Rows are sorted by the first objective, so a design is on the front
+    when it beats the running best of every other objective (exact for two
+    objectives, which is what the designer plots; for more it is a scan
+    over the first objective).
+    """
+    # turn everything into "smaller is better"
+    values = np.column_stack([
+        -results[name].to_numpy() if OBJECTIVES[name] else results[name].to_numpy()
+        for name in objectives
+    ])
+    mask = np.zeros(len(results), dtype=bool)
+    ok = np.isfinite(values).all(axis=1)
+    if feasible_only and "feasible" in results:
+        ok &= results["feasible"].to_numpy()
+
+    idx = np.flatnonzero(ok)
+    if idx.size == 0:
+        return mask
+    order = idx[np.lexsort(values[idx].T[::-1])]
+
+    if values.shape[1] == 2:
+        best = np.minimum.accumulate(values[order, 1])
+        prev = np.concatenate([[np.inf], best[:-1]])
+        mask[order[values[order, 1] < prev]] = True
+        return mask
+
+    front = []
+    for i in order:
+        if not any(np.all(values[j] <= values[i]) for j in front):
+            front.append(i)
+    mask[front] = True
+    return mask
+
+
+def save(results: pd.DataFrame, path: str):
+    """Write results as .parquet or .npz (one array per column)."""
+    if path.endswith(".parquet"):
+        results.to_parquet(path, index=False)
+    elif path.endswith(".npz"):
+        np.savez_compressed(path, **{k: v.to_numpy() for k, v in results.items()})
+    else:
+        raise ValueError("Output must end with .parquet or .npz")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latin-hypercube trade study of the designer inputs.")
+    parser.add_argument("-n", "--designs", type=int, default=1_000_000)
+    parser.add_argument("-o", "--output", default="design_study.parquet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    designs = latin_hypercube(
+        {
+            "mtow_lb": (30, 120),
+            "wing_span_ft": (8, 30),
+            "wing_area_ft2": (10, 60),
+            "cruise_speed_kt": (35, 90),
+        },
+        args.designs,
+        args.seed,
+    )
+    results = run_study(designs, args.workers)
+    results["pareto"] = pareto_front(results, ["ld", "power_required_hp"])
+    save(results, args.output)
+    print(f"Wrote {len(results):,} designs ({int(results['pareto'].sum())} on the Pareto front) to {args.output}")
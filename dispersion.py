@@ -0,0 +1,191 @@
+# dispersion.py
+"""
+Monte Carlo dispersion of Breguet range / endurance / fuel burn time.
+
+Inputs are sampled from simple distributions and evaluated with
+physics.fuel_range_estimate_batch in fixed-size chunks. Chunks run on a
+process pool and partial percentiles are yielded as chunks finish.
+
+Each chunk is reduced to a fixed-size log-binned histogram per output
+(a DDSketch-style quantile sketch: percentiles within SKETCH_ALPHA relative
+error), and sketches merge by addition, so memory and the cost of every
+partial summary stay constant however many samples are drawn.
+
+Every chunk draws from its own child of np.random.SeedSequence(seed), so
+the samples depend only on (seed, n_samples, chunk_size), never on the
+number of workers or the order chunks complete in.
+"""
+
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import physics
+
+
+DEFAULT_CHUNK = 250_000
+PERCENTILES = (1, 10, 50, 90, 99)
+OUTPUTS = ("range_km", "endurance_hr", "fuel_burn_time_hr")
+
+SKETCH_ALPHA = 0.005     # relative accuracy of the reported percentiles
+SKETCH_MIN = 1e-6        # smaller magnitudes count as zero
+SKETCH_MAX = 1e12        # larger magnitudes land in the last bin
+_LOG_GAMMA = math.log((1 + SKETCH_ALPHA) / (1 - SKETCH_ALPHA))
+_OFFSET = math.floor(math.log(SKETCH_MIN) / _LOG_GAMMA)
+SKETCH_BINS = math.ceil(math.log(SKETCH_MAX) / _LOG_GAMMA) - _OFFSET + 1
+
+# keyword arguments of physics.fuel_range_estimate_batch
+INPUTS = ("V_ms", "pax", "pax_wt_kg", "W_empty_kg", "W_fuel_kg", "c_per_hr", "LD", "S_m2", "b_m", "CD0", "e")
+
+
+def sample(spec, n: int, rng: np.random.Generator):
+    """
+    Draw n values for one input. `spec` is a number (held fixed) or a tuple:
+    ("normal", mean, sd), ("uniform", lo, hi) or ("triangular", lo, mode, hi).
+    """
+    if not isinstance(spec, (tuple, list)):
+        return float(spec)
+
+    kind, *args = spec
+    if kind == "normal":
+        return rng.normal(args[0], args[1], n)
+    if kind == "uniform":
+        return rng.uniform(args[0], args[1], n)
+    if kind == "triangular":
+        return rng.triangular(args[0], args[1], args[2], n)
+    raise ValueError(f"Unknown distribution '{kind}'. Use normal, uniform or triangular.")
+
+
+# -------------------------
+# Quantile sketch
+# -------------------------
+def sketch(values: np.ndarray) -> dict:
+    """Fixed-size summary of `values`: log-binned counts for each sign, plus totals."""
+    finite = values[np.isfinite(values)]
+
+    def bins(x):
+        idx = np.ceil(np.log(x) / _LOG_GAMMA).astype(np.int64) - _OFFSET
+        return np.bincount(np.clip(idx, 0, SKETCH_BINS - 1), minlength=SKETCH_BINS)
+
+    pos, neg = finite[finite > SKETCH_MIN], -finite[finite < -SKETCH_MIN]
+    return {
+        "pos": bins(pos),
+        "neg": bins(neg),
+        "zero": int(finite.size - pos.size - neg.size),
+        "count": int(finite.size),
+        "sum": float(finite.sum(dtype=np.float64)),
+        "invalid": int(values.size - finite.size),
+    }
+
+
+def merge_sketch(a: dict, b: dict) -> dict:
+    return {key: a[key] + b[key] for key in a}
+
+
+def sketch_percentiles(s: dict, percentiles=PERCENTILES) -> list:
+    if not s["count"]:
+        return [np.nan] * len(percentiles)
+    # bin k holds (gamma^(k-1), gamma^k]; 2 gamma^k / (gamma + 1) is within alpha of all of it
+    gamma = math.exp(_LOG_GAMMA)
+    centers = 2.0 * gamma ** (np.arange(SKETCH_BINS) + _OFFSET) / (gamma + 1.0)
+    counts = np.concatenate([s["neg"][::-1], [s["zero"]], s["pos"]])
+    values = np.concatenate([-centers[::-1], [0.0], centers])
+    cum = np.cumsum(counts)
+    ranks = np.asarray(percentiles, dtype=float) / 100.0 * (s["count"] - 1)
+    return values[np.searchsorted(cum, ranks, side="right")].tolist()
+
+
+# -------------------------
+# Sampling runs
+# -------------------------
+def evaluate_chunk(specs: dict, n: int, seed_seq: np.random.SeedSequence) -> dict:
+    """Sample and evaluate one chunk; returns a sketch per name in OUTPUTS."""
+    rng = np.random.default_rng(seed_seq)
+    inputs = {name: sample(specs[name], n, rng) for name in INPUTS}
+    result = physics.fuel_range_estimate_batch(**inputs)
+    return {name: sketch(np.broadcast_to(result[name], (n,))) for name in OUTPUTS}
+
+
+def _chunk_sizes(n_samples: int, chunk_size: int) -> list:
+    full, rest = divmod(n_samples, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def _summary(sketches: dict, done: int) -> dict:
+    out = {"samples": done}
+    for name, s in sketches.items():
+        out[name] = {f"P{p}": float(v) for p, v in zip(PERCENTILES, sketch_percentiles(s))}
+        out[name]["mean"] = s["sum"] / s["count"] if s["count"] else float("nan")
+        out[name]["invalid"] = s["invalid"]
+    return out
+
+
+def run_streaming(specs: dict, n_samples: int, seed: int = 0, chunk_size: int = DEFAULT_CHUNK, workers=None):
+    """
+    Yield a percentile summary after every finished chunk; the last one
+    covers all n_samples. workers=1 evaluates in-process (no pool).
+    Percentiles are within SKETCH_ALPHA relative error; "invalid" counts
+    samples the model rejects (NaN outputs).
+
+    Summary: {"samples": done, "range_km": {"P1", ..., "P99", "mean",
+    "invalid"}, ...} for each name in OUTPUTS.
+    """
+    sizes = _chunk_sizes(n_samples, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    sketches = None
+    done = 0
+
+    def collect(chunk, n):
+        nonlocal sketches, done
+        sketches = chunk if sketches is None else {
+            name: merge_sketch(sketches[name], chunk[name]) for name in OUTPUTS
+        }
+        done += n
+        return _summary(sketches, done)
+
+    if workers == 1 or len(sizes) == 1:
+        for n, s in zip(sizes, seeds):
+            yield collect(evaluate_chunk(specs, n, s), n)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(evaluate_chunk, specs, n, s): n for n, s in zip(sizes, seeds)}
+        for future in as_completed(futures):
+            yield collect(future.result(), futures[future])
+
+
+def run(specs: dict, n_samples: int, seed: int = 0, chunk_size: int = DEFAULT_CHUNK, workers=None) -> dict:
+    """Final summary of run_streaming."""
+    summary = None
+    for summary in run_streaming(specs, n_samples, seed, chunk_size, workers):
+        pass
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo range dispersion for a sample aircraft.")
+    parser.add_argument("-n", "--samples", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    demo = {
+        "V_ms": ("normal", 230.0, 5.0),
+        "pax": 100,
+        "pax_wt_kg": ("normal", 80.0, 8.0),
+        "W_empty_kg": 25000.0,
+        "W_fuel_kg": ("uniform", 9500.0, 10000.0),
+        "c_per_hr": ("normal", 0.6, 0.03),
+        "LD": ("triangular", 14.0, 15.0, 15.5),
+        "S_m2": 30.0,
+        "b_m": 28.0,
+        "CD0": ("normal", 0.02, 0.001),
+        "e": 0.8,
+    }
+    result = run(demo, args.samples, args.seed, workers=args.workers)
+    for name in OUTPUTS:
+        stats = result[name]
+        print(f"{name:>18}: " + "  ".join(f"P{p}={stats[f'P{p}']:.1f}" for p in PERCENTILES))
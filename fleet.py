@@ -0,0 +1,121 @@
+# fleet.py
+"""
+Simplified aircraft database and vectorized Breguet evaluation.
+
+The fleet is a columnar table (one NumPy array per property, wrapped in a
+DataFrame) built once at import, so a route is scored against every
+aircraft in a single array pass, and many routes x many aircraft as a
+matrix.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Very simplified numbers; speeds in m/s, SFC in 1/hr, masses in kg (approx)
+FLEET = pd.DataFrame(
+    {
+        "name": [
+            "Boeing 737-800",
+            "Boeing 787-9",
+            "Airbus A320neo",
+            "Airbus A350-900",
+            "Airbus A330-300",
+            "Embraer E190",
+            "Bombardier CRJ900",
+            "Gulfstream G650",
+            "Cessna Citation X",
+            "F-16 Fighting Falcon",
+            "C-130 Hercules",
+        ],
+        "cruise_speed": [230, 250, 230, 250, 240, 220, 220, 250, 260, 270, 180],
+        "SFC": [0.58, 0.52, 0.57, 0.50, 0.55, 0.60, 0.62, 0.54, 0.65, 1.2, 0.75],
+        "LD": [15, 19, 16, 20, 18, 14, 13, 18, 15, 6, 11],
+        "fuel_capacity": [
+            26000, 101000, 24210, 140000, 97530, 13000, 12000, 18300, 5600, 3000, 19000,
+        ],
+        "max_takeoff_weight": [
+            79015, 254000, 79000, 280000, 242000, 51000, 38400, 45000, 16000, 12000, 70300,
+        ],
+    }
+).astype({
+    "cruise_speed": float,
+    "SFC": float,
+    "LD": float,
+    "fuel_capacity": float,
+    "max_takeoff_weight": float,
+})
+
+# Effective cruise ~ 85% of nominal cruise (routing, climb/descent, winds)
+EFFECTIVE_SPEED_FACTOR = 0.85
+
+
+def _breguet_factor(fleet: pd.DataFrame) -> np.ndarray:
+    """V * L/D / c in meters, per aircraft (the Breguet range per unit ln(Wi/Wf))."""
+    c_sec = fleet["SFC"].to_numpy() / 3600.0
+    return fleet["cruise_speed"].to_numpy() * fleet["LD"].to_numpy() / c_sec
+
+
+def max_range_m(fleet: pd.DataFrame = FLEET) -> np.ndarray:
+    """Breguet range from MTOW down to MTOW - fuel_capacity, per aircraft."""
+    mtow = fleet["max_takeoff_weight"].to_numpy()
+    fuel = fleet["fuel_capacity"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = _breguet_factor(fleet) * np.log(mtow / (mtow - fuel))
+    # a fuel load >= MTOW has no meaningful range
+    return np.where(mtow > fuel, R, np.nan)
+
+
+def evaluate_routes(distances_km, fleet: pd.DataFrame = FLEET, air_km=None, time_hr=None) -> dict:
+    """
+    Score every route against every aircraft in one pass.
+
+    Args:
+        distances_km: scalar or array of route distances, shape (n_routes,).
+        air_km, time_hr: optional wind-corrected still-air distance and
+            flight time, shaped (n_routes, n_aircraft) (see route_winds).
+            Without them fuel uses the ground distance and time the flat
+            EFFECTIVE_SPEED_FACTOR.
+
+    Returns a dict of arrays shaped (n_routes, n_aircraft):
+        feasible (bool), fuel_needed_kg, time_hr
+    plus max_range_km shaped (n_aircraft,). Fuel and time are NaN where the
+    route is not feasible.
+    """
+    d_m = np.atleast_1d(np.asarray(distances_km, dtype=float))[:, None] * 1000.0
+
+    mtow = fleet["max_takeoff_weight"].to_numpy()
+    speed = fleet["cruise_speed"].to_numpy()
+    R_max = max_range_m(fleet)
+
+    if time_hr is None:
+        time_hr = d_m / (speed * EFFECTIVE_SPEED_FACTOR) / 3600.0
+    air_m = d_m if air_km is None else np.asarray(air_km, dtype=float) * 1000.0
+
+    feasible = air_m <= R_max   # NaN range compares False
+    # Fuel needed for this specific distance, starting at MTOW
+    fuel_needed = mtow * -np.expm1(-air_m / _breguet_factor(fleet))
+
+    return {
+        "feasible": feasible,
+        "fuel_needed_kg": np.where(feasible, fuel_needed, np.nan),
+        "time_hr": np.where(feasible, time_hr, np.nan),
+        "max_range_km": R_max / 1000.0,
+    }
+
+
+def evaluate_route(distance_km: float, fleet: pd.DataFrame = FLEET, result: dict = None) -> pd.DataFrame:
+    """
+    Table of the aircraft that can fly `distance_km`, with time and fuel.
+    `result` is an already computed evaluate_routes-style dict (e.g. with winds).
+    """
+    if result is None:
+        result = evaluate_routes(distance_km, fleet)
+    ok = result["feasible"][0]
+    return pd.DataFrame(
+        {
+            "Aircraft": fleet["name"].to_numpy()[ok],
+            "Flight Time (hr)": np.round(result["time_hr"][0][ok], 2),
+            "Fuel Needed (kg)": np.round(result["fuel_needed_kg"][0][ok], 1),
+        }
+    )
@@ -0,0 +1,166 @@
+# geocode_cache.py
+"""
+Two-tier cache for city-name geocoding.
+
+Tier 1 is an in-memory LRU (per process), tier 2 a SQLite file with a TTL so
+results survive restarts and are shared between app processes. Keys are
+normalized city names, so "  new   YORK" and "New York" hit the same entry.
+Rows seeded from airports.min.json come from the dataset rather than the
+API, so they do not expire; re-seeding refreshes them and removes seeded
+names the dataset no longer places unambiguously.
+
+Run as a script to pre-seed the file from airports.min.json:
+    python geocode_cache.py --seed airports.min.json
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from airport_index import AirportIndex, normalize_city
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "geocode.sqlite3")
+DEFAULT_TTL_S = 30 * 24 * 3600   # city coordinates hardly ever move
+DEFAULT_MEMORY_SIZE = 1024
+SEED_SOURCE = "airports"
+
+
+class GeocodeCache:
+    def __init__(self, path: str = DEFAULT_PATH, ttl_s: float = DEFAULT_TTL_S,
+                 memory_size: int = DEFAULT_MEMORY_SIZE):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.memory_size = memory_size
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()   # key -> (lat, lon, expires_at)
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # one connection shared by all threads, serialized by self._lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            " key TEXT PRIMARY KEY,"
+            " lat REAL NOT NULL,"
+            " lon REAL NOT NULL,"
+            " source TEXT NOT NULL,"
+            " stored_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def _expires_at(self, source: str, stored_at: float) -> float:
+        return math.inf if source == SEED_SOURCE else stored_at + self.ttl_s
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, city_name: str):
+        """Return cached (lat, lon) or None on a miss / expired entry."""
+        key = normalize_city(city_name)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now <= entry[2]:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+
+            row = self._db.execute(
+                "SELECT lat, lon, source, stored_at FROM geocode WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now <= self._expires_at(row[2], row[3]):
+                self._remember(key, (row[0], row[1], self._expires_at(row[2], row[3])))
+                self.hits += 1
+                return row[0], row[1]
+
+            self._memory.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, city_name: str, lat: float, lon: float, source: str = "api"):
+        key = normalize_city(city_name)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO geocode (key, lat, lon, source, stored_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, lat, lon, source, now),
+            )
+            self._db.commit()
+            self._remember(key, (lat, lon, self._expires_at(source, now)))
+
+    def seed_from_airports(self, airports_path: str = "airports.min.json") -> int:
+        """
+        Add a coordinate for every unambiguous city named in
+        airports.min.json (see AirportIndex.city_coordinates for how a city
+        is placed; names shared by distant airports are left to the API).
+        Earlier seeded rows are refreshed, seeded rows for names that are no
+        longer seeded are deleted and expired API rows replaced; unexpired
+        entries from the live API are kept.
+        Returns the number of rows added, refreshed or deleted.
+        """
+        cities = AirportIndex.from_json(airports_path).all_city_coordinates()
+
+        now = time.time()
+        expired_before = now - self.ttl_s
+        rows = [(key, lat, lon, SEED_SOURCE, now, expired_before) for key, (lat, lon) in cities.items()]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT INTO geocode (key, lat, lon, source, stored_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET lat = excluded.lat, lon = excluded.lon,"
+                " source = excluded.source, stored_at = excluded.stored_at "
+                "WHERE geocode.source = excluded.source OR geocode.stored_at < ?",
+                rows,
+            )
+            stale = [
+                (key,) for (key,) in self._db.execute(
+                    "SELECT key FROM geocode WHERE source = ?", (SEED_SOURCE,)
+                ) if key not in cities
+            ]
+            self._db.executemany(
+                "DELETE FROM geocode WHERE key = ? AND source = ?",
+                [(key, SEED_SOURCE) for (key,) in stale],
+            )
+            self._db.commit()
+            # seeded rows may have moved or gone; drop stale copies from the memory tier
+            for key in list(cities) + [key for (key,) in stale]:
+                self._memory.pop(key, None)
+            return self._db.total_changes - before
+
+    def stats(self) -> dict:
+        with self._lock:
+            stored = self._db.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "stored_entries": stored,
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the geocoding cache.")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="SQLite cache file")
+    parser.add_argument("--seed", metavar="AIRPORTS_JSON",
+                        help="pre-seed city names from airports.min.json")
+    args = parser.parse_args()
+
+    cache = GeocodeCache(args.db)
+    if args.seed:
+        added = cache.seed_from_airports(args.seed)
+        print(f"Seeded {added} cities from {args.seed}")
+    print(cache.stats())
@@ -0,0 +1,229 @@
+# http_client.py
+"""
+Shared HTTP session for every tool.
+
+One pooled requests.Session per process (keep-alive, so repeated calls to the
+same host reuse the TCP/TLS connection), bounded retries with exponential
+backoff, a default timeout per logical endpoint and simple latency metrics.
+
+For independent lookups that should overlap, aget/apost do the same over one
+pooled httpx.AsyncClient living on a background event loop, with a
+per-host concurrency limit; run() executes a coroutine on that loop from
+synchronous (Streamlit) code, submit() from another event loop (FastAPI).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# (connect, read) timeouts in seconds, per logical endpoint
+ENDPOINT_TIMEOUTS = {
+    "backend": (3.05, 10),
+    "geocoding": (3.05, 10),
+    "weather": (3.05, 8),
+    "lottie": (3.05, 10),
+    "dataset": (3.05, 60),   # read timeout is per chunk when streaming
+    "default": (3.05, 15),
+}
+
+# Backend calls are pure computations, so POST is safe to retry too.
+RETRY = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    status=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+    respect_retry_after_header=True,
+)
+
+# concurrent in-flight async requests per host (politeness to free APIs)
+HOST_CONCURRENCY = {
+    "geocoding-api.open-meteo.com": 4,
+    "api.open-meteo.com": 4,
+}
+DEFAULT_HOST_CONCURRENCY = 6
+
+POOL_CONNECTIONS = 10   # distinct hosts kept in the pool
+POOL_MAXSIZE = 20       # connections per host (Streamlit serves sessions on threads)
+LATENCY_WINDOW = 500    # samples kept per endpoint
+
+_session = None
+_session_lock = threading.Lock()
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=RETRY,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _record(endpoint: str, elapsed_s: float, ok: bool):
+    with _metrics_lock:
+        m = _metrics.get(endpoint)
+        if m is None:
+            m = _metrics[endpoint] = {
+                "count": 0,
+                "errors": 0,
+                "samples": deque(maxlen=LATENCY_WINDOW),
+            }
+        m["count"] += 1
+        if not ok:
+            m["errors"] += 1
+        m["samples"].append(elapsed_s * 1000.0)
+
+
+def request(method: str, url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    """
+    Send a request through the shared session.
+
+    `endpoint` selects the default timeout from ENDPOINT_TIMEOUTS and the
+    bucket latency is recorded under; an explicit timeout= still wins.
+    Retries happen inside the adapter, so the recorded latency includes them.
+    """
+    kwargs.setdefault(
+        "timeout", ENDPOINT_TIMEOUTS.get(endpoint, ENDPOINT_TIMEOUTS["default"])
+    )
+
+    start = time.perf_counter()
+    ok = False
+    try:
+        resp = get_session().request(method, url, **kwargs)
+        ok = resp.status_code < 400
+        return resp
+    finally:
+        _record(endpoint, time.perf_counter() - start, ok)
+
+
+def get(url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    return request("GET", url, endpoint=endpoint, **kwargs)
+
+
+def post(url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    return request("POST", url, endpoint=endpoint, **kwargs)
+
+
+def latency_stats() -> dict:
+    """
+    Per-endpoint metrics over the last LATENCY_WINDOW calls:
+    count, errors, mean_ms, p50_ms, p95_ms, max_ms.
+    """
+    stats = {}
+    with _metrics_lock:
+        for endpoint, m in _metrics.items():
+            samples = sorted(m["samples"])
+            n = len(samples)
+            stats[endpoint] = {
+                "count": m["count"],
+                "errors": m["errors"],
+                "mean_ms": sum(samples) / n if n else None,
+                "p50_ms": samples[n // 2] if n else None,
+                "p95_ms": samples[min(n - 1, int(n * 0.95))] if n else None,
+                "max_ms": samples[-1] if n else None,
+            }
+    return stats
+
+
+# -------------------------
+# Async client
+# -------------------------
+_loop = None
+_async_client = None
+_host_limits = {}
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) the background event loop that owns the async client."""
+    global _loop, _async_client
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="http-client-loop", daemon=True).start()
+                _async_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=POOL_CONNECTIONS * POOL_MAXSIZE,
+                        max_keepalive_connections=POOL_MAXSIZE,
+                    ),
+                    transport=httpx.AsyncHTTPTransport(retries=RETRY.connect),
+                    follow_redirects=True,
+                )
+                _loop = loop
+    return _loop
+
+
+def _httpx_timeout(endpoint: str) -> httpx.Timeout:
+    connect, read = ENDPOINT_TIMEOUTS.get(endpoint, ENDPOINT_TIMEOUTS["default"])
+    return httpx.Timeout(read, connect=connect)
+
+
+def _host_limit(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).hostname or ""
+    sem = _host_limits.get(host)
+    if sem is None:
+        sem = _host_limits[host] = asyncio.Semaphore(
+            HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+        )
+    return sem
+
+
+async def arequest(method: str, url: str, endpoint: str = "default", **kwargs) -> httpx.Response:
+    """
+    Async counterpart of request(); must run on the client loop (use run()).
+    Waits for a free slot of the URL's host before sending.
+    """
+    kwargs.setdefault("timeout", _httpx_timeout(endpoint))
+
+    async with _host_limit(url):
+        start = time.perf_counter()
+        ok = False
+        try:
+            resp = await _async_client.request(method, url, **kwargs)
+            ok = resp.status_code < 400
+            return resp
+        finally:
+            _record(endpoint, time.perf_counter() - start, ok)
+
+
+async def aget(url: str, endpoint: str = "default", **kwargs) -> httpx.Response:
+    return await arequest("GET", url, endpoint=endpoint, **kwargs)
+
+
+async def apost(url: str, endpoint: str = "default", **kwargs) -> httpx.Response:
+    return await arequest("POST", url, endpoint=endpoint, **kwargs)
+
+
+def run(coro, timeout: float = None):
+    """Run a coroutine on the client loop and wait for its result (thread-safe)."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
+
+def submit(coro) -> asyncio.Future:
+    """Schedule a coroutine on the client loop; await the result from another loop."""
+    return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _get_loop()))
@@ -0,0 +1,450 @@
+# isa-ai-backend/main.py
+"""
+ISA backend: physics endpoints used by the Streamlit tools and HTML pages,
+plus the /ask tutor endpoint.
+
+Run from the repository root (the physics code lives there):
+
+    uvicorn main:app --app-dir isa-ai-backend --workers 4
+
+or `python isa-ai-backend/main.py`, which reads HOST / PORT / WEB_CONCURRENCY.
+Every physics handler is a pure in-process computation, so workers share
+nothing and the service scales horizontally behind any load balancer.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import List, Literal, Union
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from openai import AsyncOpenAI, OpenAI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_index import DEFAULT_PATH as DEFAULT_AIRPORTS_PATH  # noqa: E402
+from airport_search import TOP_K, load_airport_search  # noqa: E402
+import http_client  # noqa: E402
+import physics  # noqa: E402
+from metar_cache import get_metar_cache  # noqa: E402
+from response_cache import ResponseCache, openai_embedding  # noqa: E402
+from weather_cache import get_weather_cache  # noqa: E402
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# no key -> no client, so the physics endpoints still start. The async client
+# keeps a slow completion from blocking the worker's event loop.
+client = AsyncOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+
+app = FastAPI()
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # you can restrict this to your GitHub Pages domain later
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+# -------------------------
+# Physics
+# -------------------------
+class MachRequest(BaseModel):
+    altitude_m: float
+    speed_value: float
+    speed_unit: str = "m/s"
+
+
+class FuelRangeRequest(BaseModel):
+    V_ms: float
+    pax: int = 0
+    pax_wt_kg: float = 80.0
+    W_empty_kg: float
+    W_fuel_kg: float
+    c_per_hr: float
+    LD: float
+    S_m2: float
+    b_m: float
+    CD0: float = 0.02
+    e: float = 0.8
+    altitude_m: float = physics.DEFAULT_CRUISE_ALTITUDE_M
+
+
+class MissionRequest(BaseModel):
+    Wi_kg: float
+    fuel_weight_kg: float
+    cruise_speed_ms: float
+    c_per_hr: float
+    LD: float
+
+
+def _compute(fn, *args, **kwargs):
+    """Run a physics function, turning its ValueError into a 400."""
+    try:
+        return fn(*args, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/isa")
+async def isa(altitude_m: float):
+    return _compute(physics.isa_properties, altitude_m)
+
+
+@app.post("/api/mach/compute")
+async def mach_compute(req: MachRequest):
+    return _compute(physics.mach_properties, req.altitude_m, req.speed_value, req.speed_unit)
+
+
+@app.post("/api/fuel-range/estimate")
+async def fuel_range_estimate(req: FuelRangeRequest):
+    return _compute(physics.fuel_range_estimate, **req.model_dump())
+
+
+@app.post("/api/mission-planner/estimate")
+async def mission_planner_estimate(req: MissionRequest):
+    return _compute(physics.mission_estimate, **req.model_dump())
+
+
+# -------------------------
+# Batch physics
+# -------------------------
+# Array fields accept a list or a single value (broadcast over the batch).
+# Responses are columnar JSON by default ({"n": ..., "columns": {name: [...]}},
+# NaN -> null); ?format=ndjson streams one row per line and ?format=arrow
+# returns an Arrow IPC stream for large batches. The handlers are plain `def`
+# so FastAPI runs them in its threadpool and a big batch never blocks the loop.
+MAX_BATCH = 1_000_000
+NDJSON_CHUNK = 4096
+
+Values = Union[List[float], float]
+BatchFormat = Literal["json", "ndjson", "arrow"]
+
+
+class IsaBatchRequest(BaseModel):
+    altitude_m: Values
+
+
+class MachBatchRequest(BaseModel):
+    altitude_m: Values
+    speed_value: Values
+    speed_unit: str = "m/s"
+
+
+class FuelRangeBatchRequest(BaseModel):
+    V_ms: Values
+    pax: Values = 0.0
+    pax_wt_kg: Values = 80.0
+    W_empty_kg: Values
+    W_fuel_kg: Values
+    c_per_hr: Values
+    LD: Values
+    S_m2: Values
+    b_m: Values
+    CD0: Values = 0.02
+    e: Values = 0.8
+    altitude_m: Values = physics.DEFAULT_CRUISE_ALTITUDE_M
+
+
+class MissionBatchRequest(BaseModel):
+    Wi_kg: Values
+    fuel_weight_kg: Values
+    cruise_speed_ms: Values
+    c_per_hr: Values
+    LD: Values
+
+
+def _json_column(col: np.ndarray) -> list:
+    # NaN and ±inf are not valid JSON; strict clients get null instead
+    if col.dtype.kind == "f":
+        return np.where(np.isfinite(col), col, None).tolist()
+    return col.tolist()
+
+
+def _ndjson(columns: dict):
+    names = list(columns)
+    lists = [_json_column(columns[k]) for k in names]
+    n = len(lists[0]) if lists else 0
+    for start in range(0, n, NDJSON_CHUNK):
+        rows = zip(*(col[start:start + NDJSON_CHUNK] for col in lists))
+        yield "".join(json.dumps(dict(zip(names, row))) + "\n" for row in rows)
+
+
+def _arrow(columns: dict) -> bytes:
+    import pyarrow as pa
+
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _batch(fn, fmt: str, **inputs):
+    """Run a columnar physics function and encode the result as `fmt`."""
+    sizes = [len(v) for v in inputs.values() if isinstance(v, list)]
+    if max(sizes, default=1) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"Batch size is limited to {MAX_BATCH} points.")
+
+    try:
+        columns = fn(**inputs)
+    except ValueError as e:   # also raised by NumPy for mismatched lengths
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if fmt == "ndjson":
+        return StreamingResponse(_ndjson(columns), media_type="application/x-ndjson")
+    if fmt == "arrow":
+        return Response(_arrow(columns), media_type="application/vnd.apache.arrow.stream")
+
+    n = len(next(iter(columns.values())))
+    return {"n": n, "columns": {k: _json_column(v) for k, v in columns.items()}}
+
+
+@app.post("/api/isa/batch")
+def isa_batch(req: IsaBatchRequest, format: BatchFormat = "json"):
+    return _batch(physics.isa_properties_batch, format, **req.model_dump())
+
+
+@app.post("/api/mach/batch")
+def mach_batch(req: MachBatchRequest, format: BatchFormat = "json"):
+    return _batch(physics.mach_properties_batch, format, **req.model_dump())
+
+
+@app.post("/api/fuel-range/batch")
+def fuel_range_batch(req: FuelRangeBatchRequest, format: BatchFormat = "json"):
+    return _batch(physics.fuel_range_estimate_batch, format, **req.model_dump())
+
+
+@app.post("/api/mission-planner/batch")
+def mission_planner_batch(req: MissionBatchRequest, format: BatchFormat = "json"):
+    return _batch(physics.mission_estimate_batch, format, **req.model_dump())
+
+
+# -------------------------
+# Weather snapshots
+# -------------------------
+# Open-Meteo proxied through weather_cache: requests in the same ~11 km cell
+# and time bucket share one upstream call, and a stale snapshot is served
+# while it refreshes. X-Weather-Cache reports hit / stale / miss.
+async def _weather(kind: str, lat: float, lon: float, level: int = None):
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        raise HTTPException(status_code=400, detail="lat must be in [-90, 90] and lon in [-180, 180].")
+    try:
+        data, status = await http_client.submit(get_weather_cache().get(kind, lat, lon, level))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Weather upstream failed: {e}")
+    return Response(
+        json.dumps(data),
+        media_type="application/json",
+        headers={"X-Weather-Cache": status, "Cache-Control": "public, max-age=300"},
+    )
+
+
+@app.get("/api/weather/current")
+async def weather_current(lat: float, lon: float):
+    return await _weather("current", lat, lon)
+
+
+@app.get("/api/weather/surface")
+async def weather_surface(lat: float, lon: float):
+    return await _weather("surface", lat, lon)
+
+
+@app.get("/api/weather/winds-aloft")
+async def weather_winds_aloft(lat: float, lon: float, level: int):
+    return await _weather("winds_aloft", lat, lon, level)
+
+
+@app.get("/api/weather/cache")
+async def weather_cache_stats():
+    return get_weather_cache().stats()
+
+
+# -------------------------
+# METAR
+# -------------------------
+# Served from metar_cache until the station's next routine report is due;
+# Cache-Control carries the same deadline so browsers cache it too.
+MAX_METAR_STATIONS = 100
+
+
+async def _metars(stations: list):
+    try:
+        return await http_client.submit(get_metar_cache().get_many(stations))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"METAR upstream failed: {e}")
+
+
+def _max_age(seconds: float) -> dict:
+    return {"Cache-Control": f"public, max-age={int(seconds)}"}
+
+
+@app.get("/api/metar")
+async def metar_bulk(ids: str):
+    """Latest METAR for up to MAX_METAR_STATIONS comma-separated stations."""
+    stations = [s for s in ids.split(",") if s.strip()]
+    if not stations or len(stations) > MAX_METAR_STATIONS:
+        raise HTTPException(status_code=400, detail=f"ids must list 1 to {MAX_METAR_STATIONS} stations.")
+    reports, max_age = await _metars(stations)
+    return Response(json.dumps({"metars": reports}), media_type="application/json", headers=_max_age(max_age))
+
+
+@app.get("/api/metar/{station}")
+async def metar(station: str):
+    reports, max_age = await _metars([station])
+    report = next(iter(reports.values()))
+    if report is None:
+        return Response(status_code=204, headers=_max_age(max_age))
+    return Response(json.dumps(report), media_type="application/json", headers=_max_age(max_age))
+
+
+@app.get("/api/metar-cache")
+async def metar_cache_stats():
+    return get_metar_cache().stats()
+
+
+# -------------------------
+# Airport search
+# -------------------------
+# Built once per worker at import from airports.min.json
+# (python build_airports_min.py); queries take well under a millisecond.
+airport_search = load_airport_search(os.getenv("AIRPORTS_PATH", DEFAULT_AIRPORTS_PATH))
+
+
+@app.get("/api/airports/search")
+def airports_search(q: str, limit: int = TOP_K):
+    if not len(airport_search):
+        raise HTTPException(status_code=503, detail="Airport dataset not built; run build_airports_min.py.")
+    if not 1 <= limit <= TOP_K:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {TOP_K}.")
+    results = airport_search.search(q[:64], limit)
+    return Response(
+        json.dumps({"results": results}),
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
+
+
+# -------------------------
+# Tutor
+# -------------------------
+TUTOR_SYSTEM_PROMPT = (
+    "You are ISA, a friendly aerospace engineering tutor. "
+    "Explain concepts clearly for students, with short, precise answers."
+)
+
+# per worker process; keyed on the system prompt, so editing it starts fresh.
+# Exact matches only, unless ANSWER_CACHE_EMBEDDING_MODEL opts in to the
+# similarity tier (a real embedding model; threshold ANSWER_CACHE_THRESHOLD).
+ANSWER_CACHE_EMBEDDING_MODEL = os.getenv("ANSWER_CACHE_EMBEDDING_MODEL")
+if ANSWER_CACHE_EMBEDDING_MODEL and OPENAI_API_KEY:
+    answer_cache = ResponseCache(
+        embed=openai_embedding(OpenAI(api_key=OPENAI_API_KEY), ANSWER_CACHE_EMBEDDING_MODEL),
+        threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95")),
+    )
+else:
+    answer_cache = ResponseCache()
+
+
+class Question(BaseModel):
+    question: str
+
+
+def _tutor_messages(question: str) -> list:
+    return [
+        {"role": "system", "content": TUTOR_SYSTEM_PROMPT},
+        {"role": "user", "content": question},
+    ]
+
+
+@app.post("/ask")
+async def ask(q: Question):
+    cached = await asyncio.to_thread(answer_cache.get, q.question, TUTOR_SYSTEM_PROMPT)
+    if cached is not None:
+        return {"answer": cached, "cached": True}
+
+    if not OPENAI_API_KEY:
+        return {"answer": "Backend is not configured with an OpenAI API key."}
+
+    resp = await client.chat.completions.create(
+        model="gpt-4.1-mini",
+        messages=_tutor_messages(q.question),
+        max_tokens=400,
+    )
+
+    answer = resp.choices[0].message.content
+    await asyncio.to_thread(answer_cache.put, q.question, answer, TUTOR_SYSTEM_PROMPT)
+    return {"answer": answer, "cached": False}
+
+
+def _sse(payload) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@app.post("/ask/stream")
+async def ask_stream(q: Question):
+    """
+    Server-sent events: {"delta": "..."} per token chunk, then
+    {"done": true, "cached": bool}. Errors arrive as {"error": "..."}.
+    """
+    async def events():
+        cached = await asyncio.to_thread(answer_cache.get, q.question, TUTOR_SYSTEM_PROMPT)
+        if cached is not None:
+            yield _sse({"delta": cached})
+            yield _sse({"done": True, "cached": True})
+            return
+
+        if not OPENAI_API_KEY:
+            yield _sse({"error": "Backend is not configured with an OpenAI API key."})
+            return
+
+        parts = []
+        try:
+            stream = await client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=_tutor_messages(q.question),
+                max_tokens=400,
+                stream=True,
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield _sse({"delta": delta})
+        except Exception as e:
+            yield _sse({"error": str(e)})
+            return
+
+        await asyncio.to_thread(answer_cache.put, q.question, "".join(parts), TUTOR_SYSTEM_PROMPT)
+        yield _sse({"done": True, "cached": False})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/ask/cache")
+async def ask_cache_stats():
+    return answer_cache.stats()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "4")),
+    )
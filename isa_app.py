@@ -1,7 +1,8 @@
 import streamlit as st
 from streamlit_lottie import st_lottie
-import requests 
+import pandas as pd
 
+import http_client
 from utils import load_lottieurl
 from tools import (
     isa_tool,
@@ -53,6 +54,11 @@ tool = st.sidebar.selectbox(
 
 st.session_state["tool"] = tool
 
+net_stats = http_client.latency_stats()
+if net_stats:
+    with st.sidebar.expander("Network latency"):
+        st.dataframe(pd.DataFrame(net_stats).T.round(1), use_container_width=True)
+
 # ---------------------------------
 # Lottie animation
 # ---------------------------------
@@ -0,0 +1,199 @@
+# metar_cache.py
+"""
+METAR cache for the backend /api/metar endpoints (index.html station panel).
+
+Stations report routinely once an hour, so each entry lives until the next
+routine report is expected to reach the feed (observation time + 1 h +
+PUBLISH_GRACE_S), rather than a fixed TTL: a METAR observed at 14:53 is
+served from memory until ~16:03 and then re-polled every OVERDUE_TTL_S
+until a newer one appears. Stations with no report are remembered for
+MISSING_TTL_S.
+
+Lookups for many stations go upstream as one request per UPSTREAM_BATCH
+missing stations; concurrent lookups of a station share the in-flight
+request. If the upstream fails, expired entries are served rather than
+nothing. Like weather_cache, everything runs on the http_client loop.
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import http_client
+
+
+METAR_URL = "https://aviationweather.gov/api/data/metar"
+ROUTINE_INTERVAL_S = 3600
+PUBLISH_GRACE_S = 600      # reports reach the feed a few minutes after observation
+MIN_TTL_S = 60
+OVERDUE_TTL_S = 300
+MISSING_TTL_S = 600
+UPSTREAM_BATCH = 100
+MAX_ENTRIES = 8192
+
+_STATION_RE = re.compile(r"^[A-Z0-9]{3,4}$")
+
+
+def normalize_station(code: str) -> str:
+    station = str(code or "").strip().upper()
+    if not _STATION_RE.match(station):
+        raise ValueError(f"'{code}' is not an ICAO/IATA station code.")
+    return station
+
+
+def metar_ttl(obs_time: float, now: float) -> float:
+    """Seconds until the next routine report should be available."""
+    next_expected = obs_time + ROUTINE_INTERVAL_S + PUBLISH_GRACE_S
+    if next_expected <= now:
+        return OVERDUE_TTL_S
+    return max(MIN_TTL_S, next_expected - now)
+
+
+def parse_metar(report: dict) -> dict:
+    """aviationweather.gov JSON -> the fields the station panel shows."""
+    layers = [
+        f"{c['cover']} {c['base']} ft" if c.get("base") is not None else c["cover"]
+        for c in report.get("clouds") or [] if c.get("cover")
+    ]
+    sky = ", ".join(layers) or "—"
+    category = report.get("fltCat")
+    obs = report.get("obsTime")
+    return {
+        "icao": report.get("icaoId"),
+        "name": report.get("name"),
+        "observed_at": datetime.fromtimestamp(obs, timezone.utc).isoformat() if obs else None,
+        "temp_c": report.get("temp"),
+        "dewpoint_c": report.get("dewp"),
+        "wind_dir_deg": report.get("wdir"),
+        "wind_kt": report.get("wspd"),
+        "gust_kt": report.get("wgst"),
+        "visibility_mi": report.get("visib"),
+        "altimeter_hpa": report.get("altim"),
+        "flight_category": category,
+        "sky": f"{category} · {sky}" if category else sky,
+        "raw_text": report.get("rawOb"),
+    }
+
+
+class MetarCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+
+        self._entries = OrderedDict()   # station -> (metar dict or None, expires_at)
+        self._inflight = {}             # station -> asyncio.Task -> {station: metar}
+
+    async def get_many(self, stations):
+        """
+        -> ({station: metar dict or None}, seconds until the first entry expires).
+        Raises ValueError for bad codes and the upstream error when a station
+        has nothing cached to fall back on.
+        """
+        stations = list(dict.fromkeys(normalize_station(s) for s in stations))
+        now = time.time()
+        found, pending, missing = {}, {}, []
+
+        for s in stations:
+            entry = self._entries.get(s)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(s)
+                found[s] = entry[0]
+            elif s in self._inflight:
+                pending[s] = self._inflight[s]
+            else:
+                missing.append(s)
+        self.hits += len(found)
+        self.misses += len(stations) - len(found)
+
+        for i in range(0, len(missing), UPSTREAM_BATCH):
+            chunk = missing[i:i + UPSTREAM_BATCH]
+            task = asyncio.ensure_future(self._fetch(chunk))
+            task.add_done_callback(lambda t, chunk=chunk: self._done(t, chunk))
+            for s in chunk:
+                self._inflight[s] = pending[s] = task
+
+        if pending:
+            await asyncio.shield(asyncio.gather(*set(pending.values())))
+            for s, task in pending.items():
+                found[s] = task.result().get(s)
+
+        now = time.time()
+        expires = [self._entries[s][1] for s in stations if s in self._entries]
+        max_age = max(0.0, min(expires) - now) if expires else 0.0
+        return {s: found[s] for s in stations}, max_age
+
+    async def get(self, station: str):
+        """-> (metar dict or None, seconds until it expires)"""
+        reports, max_age = await self.get_many([station])
+        return next(iter(reports.values())), max_age
+
+    def _done(self, task: asyncio.Task, chunk: list):
+        for s in chunk:
+            if self._inflight.get(s) is task:
+                del self._inflight[s]
+        task.exception()   # retrieved here so a failed fetch is never "unhandled"
+
+    async def _fetch(self, chunk: list) -> dict:
+        self.upstream_calls += 1
+        try:
+            r = await http_client.aget(
+                METAR_URL, endpoint="weather", params={"ids": ",".join(chunk), "format": "json"},
+            )
+            r.raise_for_status()
+            reports = r.json() if r.status_code != 204 and r.content else []
+        except Exception:
+            self.upstream_errors += 1
+            if all(s in self._entries for s in chunk):
+                return {s: self._entries[s][0] for s in chunk}
+            raise
+
+        # newest report per station
+        latest = {}
+        for report in reports:
+            s = str(report.get("icaoId", "")).upper()
+            if s not in latest or (report.get("obsTime") or 0) > (latest[s].get("obsTime") or 0):
+                latest[s] = report
+
+        now = time.time()
+        out = {}
+        for s in chunk:
+            report = latest.get(s)
+            if report is not None and report.get("obsTime"):
+                out[s], ttl = parse_metar(report), metar_ttl(report["obsTime"], now)
+            elif report is not None:
+                out[s], ttl = parse_metar(report), OVERDUE_TTL_S
+            else:
+                out[s], ttl = None, MISSING_TTL_S
+            self._entries[s] = (out[s], now + ttl)
+            self._entries.move_to_end(s)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return out
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "entries": len(self._entries),
+        }
+
+
+_default = None
+
+
+def get_metar_cache() -> MetarCache:
+    """Process-wide cache (one per backend worker process)."""
+    global _default
+    if _default is None:
+        _default = MetarCache()
+    return _default
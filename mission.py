@@ -0,0 +1,334 @@
+# mission.py
+"""
+Segment-wise mission fuel integration, vectorized over mission variants.
+
+A Mission is a list of segments (climb, cruise, step climb, descent,
+reserve, or any Segment subclass). Every input may be a scalar or an array
+over variants, so one run evaluates thousands of missions as NumPy arrays.
+
+Every built-in segment burns fuel as
+
+    dm/dt = -c(m, h) * m * k
+
+where c is the SFC in 1/s and k is the segment's thrust-to-weight ratio
+(1/(L/D), plus ROC/V while climbing). With a constant SFC this integrates to
+a Breguet-type closed form, which is used automatically; with a callable
+SFC (weight- or altitude-dependent) each segment is time-stepped with RK4.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+
+DEFAULT_DT_S = 60.0
+
+
+# -------------------------
+# SFC models
+# -------------------------
+def linear_sfc(c_per_hr, slope: float, m_ref_kg):
+    """
+    SFC that varies linearly with mass: c = c0 * (1 + slope * (m / m_ref - 1)).
+    Returns a callable usable as Mission.run(sfc=...).
+    """
+    c0 = np.asarray(c_per_hr, dtype=float)
+    m_ref = np.asarray(m_ref_kg, dtype=float)
+
+    def sfc(mass_kg, altitude_m):
+        return c0 * (1.0 + slope * (mass_kg / m_ref - 1.0))
+
+    return sfc
+
+
+# -------------------------
+# Segments
+# -------------------------
+class Segment:
+    """
+    Base class. Subclasses define the segment's duration, ground distance
+    and thrust-to-weight ratio for the current state; the Mission handles
+    the integration. Override integrate() for segments that do not fit
+    dm/dt = -c * m * k.
+    """
+
+    name = "segment"
+
+    def duration_s(self, state: dict) -> np.ndarray:
+        raise NotImplementedError
+
+    def thrust_to_weight(self, state: dict) -> np.ndarray:
+        raise NotImplementedError
+
+    def ground_speed_ms(self, state: dict) -> np.ndarray:
+        return np.zeros_like(state["mass_kg"])
+
+    def end_altitude_m(self, state: dict) -> np.ndarray:
+        return state["altitude_m"]
+
+    def integrate(self, state: dict, sfc, dt_s: float) -> dict:
+        """Return the state at the end of the segment."""
+        t = self.duration_s(state)
+        k = self.thrust_to_weight(state)
+        h0 = state["altitude_m"]
+        h1 = self.end_altitude_m(state)
+
+        shape = np.broadcast_shapes(state["mass_kg"].shape, np.shape(t), np.shape(k))
+        m0 = np.broadcast_to(state["mass_kg"], shape)
+        t = np.broadcast_to(t, shape)
+
+        if callable(sfc):
+            mass = _rk4_mass(m0, t, k, h0, h1, sfc, dt_s)
+        else:
+            # analytic fast path: m1 = m0 * exp(-c k t)
+            mass = m0 * np.exp(-np.asarray(sfc) / 3600.0 * k * t)
+
+        return {
+            "mass_kg": mass,
+            "altitude_m": np.broadcast_to(h1, mass.shape),
+            "time_s": state["time_s"] + t,
+            "distance_m": state["distance_m"] + self.ground_speed_ms(state) * t,
+        }
+
+
+def _rk4_mass(m0, t, k, h0, h1, sfc, dt_s):
+    """
+    Fixed-step RK4 for dm/dt = -c(m, h)/3600 * m * k over [0, t].
+
+    Every variant takes the same number of steps (set by the longest one)
+    with its own step length, so the loop runs over steps, not variants.
+    Altitude is interpolated linearly through the segment.
+    """
+    n_steps = max(int(np.ceil(np.max(t, initial=0.0) / dt_s)), 1)
+    step = t / n_steps
+    k = np.broadcast_to(k, m0.shape)
+    h0 = np.broadcast_to(h0, m0.shape)
+    dh = (np.broadcast_to(h1, m0.shape) - h0) / n_steps
+
+    def rate(m, h):
+        return -sfc(m, h) / 3600.0 * m * k
+
+    m = m0.astype(float)
+    for i in range(n_steps):
+        h = h0 + dh * i
+        k1 = rate(m, h)
+        k2 = rate(m + 0.5 * step * k1, h + 0.5 * dh)
+        k3 = rate(m + 0.5 * step * k2, h + 0.5 * dh)
+        k4 = rate(m + step * k3, h + dh)
+        m = m + step / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+    return m
+
+
+class Climb(Segment):
+    """Constant rate of climb at true airspeed `speed_ms` up to `altitude_m`."""
+
+    name = "climb"
+
+    def __init__(self, altitude_m, rate_ms=10.0, speed_ms=150.0, LD=12.0):
+        self.altitude_m = np.asarray(altitude_m, dtype=float)
+        self.rate_ms = np.asarray(rate_ms, dtype=float)
+        self.speed_ms = np.asarray(speed_ms, dtype=float)
+        self.LD = np.asarray(LD, dtype=float)
+
+    def duration_s(self, state):
+        return np.maximum(self.altitude_m - state["altitude_m"], 0.0) / self.rate_ms
+
+    def thrust_to_weight(self, state):
+        return 1.0 / self.LD + self.rate_ms / self.speed_ms
+
+    def ground_speed_ms(self, state):
+        return np.sqrt(np.maximum(self.speed_ms ** 2 - self.rate_ms ** 2, 0.0))
+
+    def end_altitude_m(self, state):
+        return np.maximum(self.altitude_m, state["altitude_m"])
+
+
+class StepClimb(Climb):
+    """A climb between cruise legs; same model as Climb."""
+
+    name = "step climb"
+
+
+class Cruise(Segment):
+    """Level flight over `distance_km` at `speed_ms` and constant L/D."""
+
+    name = "cruise"
+
+    def __init__(self, distance_km, speed_ms=230.0, LD=16.0):
+        self.distance_m = np.asarray(distance_km, dtype=float) * 1000.0
+        self.speed_ms = np.asarray(speed_ms, dtype=float)
+        self.LD = np.asarray(LD, dtype=float)
+
+    def duration_s(self, state):
+        return self.distance_m / self.speed_ms
+
+    def thrust_to_weight(self, state):
+        return 1.0 / self.LD
+
+    def ground_speed_ms(self, state):
+        return self.speed_ms
+
+
+class Descent(Segment):
+    """
+    Constant rate of descent to `altitude_m` with engines near idle:
+    thrust is `idle_fraction` of the level-flight thrust.
+    """
+
+    name = "descent"
+
+    def __init__(self, altitude_m=0.0, rate_ms=8.0, speed_ms=140.0, LD=14.0, idle_fraction=0.15):
+        self.altitude_m = np.asarray(altitude_m, dtype=float)
+        self.rate_ms = np.asarray(rate_ms, dtype=float)
+        self.speed_ms = np.asarray(speed_ms, dtype=float)
+        self.LD = np.asarray(LD, dtype=float)
+        self.idle_fraction = np.asarray(idle_fraction, dtype=float)
+
+    def duration_s(self, state):
+        return np.maximum(state["altitude_m"] - self.altitude_m, 0.0) / self.rate_ms
+
+    def thrust_to_weight(self, state):
+        return self.idle_fraction / self.LD
+
+    def ground_speed_ms(self, state):
+        return np.sqrt(np.maximum(self.speed_ms ** 2 - self.rate_ms ** 2, 0.0))
+
+    def end_altitude_m(self, state):
+        return np.minimum(self.altitude_m, state["altitude_m"])
+
+
+class Reserve(Segment):
+    """Holding for `minutes` at the loiter L/D (Breguet endurance form)."""
+
+    name = "reserve"
+
+    def __init__(self, minutes=45.0, LD=17.0, speed_ms=0.0):
+        self.duration = np.asarray(minutes, dtype=float) * 60.0
+        self.LD = np.asarray(LD, dtype=float)
+        self.speed_ms = np.asarray(speed_ms, dtype=float)
+
+    def duration_s(self, state):
+        return self.duration
+
+    def thrust_to_weight(self, state):
+        return 1.0 / self.LD
+
+    def ground_speed_ms(self, state):
+        return self.speed_ms
+
+
+# -------------------------
+# Mission
+# -------------------------
+class Mission:
+    def __init__(self, segments: list):
+        self.segments = list(segments)
+
+    def run(self, W0_kg, sfc, start_altitude_m=0.0, dt_s: float = DEFAULT_DT_S) -> dict:
+        """
+        Fly every variant through all segments.
+
+        Args:
+            W0_kg: takeoff mass, scalar or array over variants.
+            sfc: constant SFC in 1/hr (scalar or array; closed-form path) or
+                a callable sfc(mass_kg, altitude_m) -> 1/hr (RK4 path).
+            dt_s: target time step for the RK4 path.
+
+        Returns arrays over variants (mass_kg, fuel_kg, time_hr,
+        distance_km) and per-segment fuel_by_segment_kg / time_by_segment_hr
+        shaped (n_segments, n_variants), plus the segment names.
+        """
+        m0 = np.atleast_1d(np.asarray(W0_kg, dtype=float))
+        zeros = np.zeros_like(m0)
+        state = {
+            "mass_kg": m0,
+            "altitude_m": zeros + start_altitude_m,
+            "time_s": zeros,
+            "distance_m": zeros,
+        }
+
+        fuel, times = [], []
+        for segment in self.segments:
+            nxt = segment.integrate(state, sfc, dt_s)
+            fuel.append(state["mass_kg"] - nxt["mass_kg"])
+            times.append((nxt["time_s"] - state["time_s"]) / 3600.0)
+            state = nxt
+
+        return {
+            "segments": [s.name for s in self.segments],
+            "mass_kg": state["mass_kg"],
+            "fuel_kg": m0 - state["mass_kg"],
+            "time_hr": state["time_s"] / 3600.0,
+            "distance_km": state["distance_m"] / 1000.0,
+            "fuel_by_segment_kg": np.array(fuel),
+            "time_by_segment_hr": np.array(times),
+        }
+
+
+def standard_mission(
+    cruise_distance_km,
+    cruise_altitude_m=10000.0,
+    step_altitude_m=None,
+    cruise_speed_ms=230.0,
+    LD=16.0,
+    reserve_min=45.0,
+) -> Mission:
+    """
+    Climb, cruise (split in two around an optional step climb), descent and
+    reserve. Arguments may be arrays over variants.
+    """
+    if step_altitude_m is None:
+        cruise = [Cruise(cruise_distance_km, cruise_speed_ms, LD)]
+    else:
+        half = np.asarray(cruise_distance_km, dtype=float) / 2.0
+        cruise = [
+            Cruise(half, cruise_speed_ms, LD),
+            StepClimb(step_altitude_m, rate_ms=5.0, speed_ms=cruise_speed_ms, LD=LD),
+            Cruise(half, cruise_speed_ms, LD),
+        ]
+    return Mission(
+        [Climb(cruise_altitude_m, LD=0.75 * np.asarray(LD, dtype=float))]
+        + cruise
+        + [Descent(0.0, LD=np.asarray(LD, dtype=float)), Reserve(reserve_min, LD=np.asarray(LD, dtype=float))]
+    )
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def benchmark(n_variants: int = 100_000, repeat: int = 5, seed: int = 0) -> dict:
+    """
+    Missions per second for random variants of a step-climb mission, for
+    the closed-form path and the RK4 path (linear weight-dependent SFC).
+    """
+    rng = np.random.default_rng(seed)
+    W0 = rng.uniform(60000, 80000, n_variants)
+    c = rng.uniform(0.5, 0.7, n_variants)
+    mission = standard_mission(
+        cruise_distance_km=rng.uniform(500, 5000, n_variants),
+        cruise_altitude_m=rng.uniform(9000, 11000, n_variants),
+        step_altitude_m=11500.0,
+        cruise_speed_ms=rng.uniform(210, 250, n_variants),
+        LD=rng.uniform(14, 19, n_variants),
+    )
+
+    rates = {}
+    for label, sfc in (("analytic", c), ("rk4", linear_sfc(c, 0.2, W0))):
+        best = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            mission.run(W0, sfc)
+            best = min(best, time.perf_counter() - start)
+        rates[label] = n_variants / best
+    return rates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized mission integrator.")
+    parser.add_argument("-n", "--variants", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, rate in benchmark(args.variants, args.repeat).items():
+        print(f"{label:>8}: {rate:,.0f} missions/s ({args.variants:,} variants)")
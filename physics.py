@@ -0,0 +1,352 @@
+# physics.py
+"""
+In-process versions of the ISA backend calculations.
+
+Each function returns the same dict the matching backend endpoint returns,
+so tools can switch between the local engine and BACKEND_URL without
+changing how they read results.
+"""
+
+import math
+
+import numpy as np
+
+from utils import isa_atmosphere, isa_atmosphere_array
+
+
+SPEED_TO_MS = {
+    "m/s": 1.0,
+    "ft/s": 0.3048,
+    "knots": 0.514444,
+}
+
+
+def flow_regime(mach: float) -> str:
+    if mach < 0.8:
+        return "Subsonic"
+    if mach < 1.2:
+        return "Transonic"
+    if mach < 5.0:
+        return "Supersonic"
+    return "Hypersonic"
+
+
+def isa_properties(altitude_m: float) -> dict:
+    """Same payload as GET /api/isa. Raises ValueError outside 0–47 km."""
+    result = isa_atmosphere(altitude_m)
+    if result is None:
+        raise ValueError("Altitude must be between 0 and 47,000 m.")
+
+    T, P, rho, a = result
+    return {
+        "altitude_m": altitude_m,
+        "temperature_K": T,
+        "pressure_Pa": P,
+        "density_kg_m3": rho,
+        "speed_of_sound_m_s": a,
+    }
+
+
+def mach_properties(altitude_m: float, speed_value: float, speed_unit: str) -> dict:
+    """Same payload as POST /api/mach/compute."""
+    if speed_unit not in SPEED_TO_MS:
+        raise ValueError(
+            f"Invalid speed_unit '{speed_unit}'. Use 'm/s', 'ft/s', or 'knots'."
+        )
+
+    isa = isa_properties(altitude_m)
+    V = speed_value * SPEED_TO_MS[speed_unit]
+    a = isa["speed_of_sound_m_s"]
+    mach = V / a
+
+    return {
+        "altitude_m": altitude_m,
+        "speed_m_s": V,
+        "speed_of_sound_m_s": a,
+        "temperature_K": isa["temperature_K"],
+        "mach": mach,
+        "flow_regime": flow_regime(mach),
+    }
+
+
+# -------------------------
+# Breguet range / fuel
+# -------------------------
+G0 = 9.80665
+M_TO_KM = 1e-3
+M_TO_NM = 1.0 / 1852.0
+M_TO_MI = 1.0 / 1609.344
+
+# The fuel & range page has no altitude input; drag is evaluated here.
+DEFAULT_CRUISE_ALTITUDE_M = 10000.0
+
+
+def _check_weights(Wi: float, Wf: float):
+    if Wf <= 0 or Wi <= Wf:
+        raise ValueError(
+            "Invalid weight combination: fuel must be positive and less than "
+            "the initial weight."
+        )
+
+
+def breguet_range_m(V_ms: float, c_per_hr: float, LD: float, Wi: float, Wf: float) -> float:
+    """Breguet jet range R = (V / c) * (L/D) * ln(Wi / Wf), c in 1/hr."""
+    return V_ms / (c_per_hr / 3600.0) * LD * math.log(Wi / Wf)
+
+
+def fuel_range_estimate(
+    V_ms: float,
+    pax: int,
+    pax_wt_kg: float,
+    W_empty_kg: float,
+    W_fuel_kg: float,
+    c_per_hr: float,
+    LD: float,
+    S_m2: float,
+    b_m: float,
+    CD0: float,
+    e: float,
+    altitude_m: float = DEFAULT_CRUISE_ALTITUDE_M,
+) -> dict:
+    """
+    Same payload as POST /api/fuel-range/estimate.
+
+    Range and endurance come from the Breguet equations. Fuel burn time uses
+    a thrust = drag model at the mean cruise weight: parabolic polar
+    CD = CD0 + CL^2 / (pi e AR) and fuel flow = c * D.
+    """
+    if V_ms <= 0 or c_per_hr <= 0 or LD <= 0 or S_m2 <= 0 or b_m <= 0 or e <= 0:
+        raise ValueError("Speed, SFC, L/D, wing area, span and e must be positive.")
+    if CD0 < 0:
+        raise ValueError("CD0 cannot be negative.")
+
+    W_pax = pax * pax_wt_kg
+    Wi = W_empty_kg + W_fuel_kg + W_pax
+    Wf = Wi - W_fuel_kg
+    _check_weights(Wi, Wf)
+
+    R = breguet_range_m(V_ms, c_per_hr, LD, Wi, Wf)
+    endurance_hr = LD / c_per_hr * math.log(Wi / Wf)
+
+    rho = isa_properties(altitude_m)["density_kg_m3"]
+    q = 0.5 * rho * V_ms ** 2
+    AR = b_m ** 2 / S_m2
+    CL = 0.5 * (Wi + Wf) * G0 / (q * S_m2)
+    CD = CD0 + CL ** 2 / (math.pi * e * AR)
+    D = q * S_m2 * CD
+    fuel_flow_kg_hr = c_per_hr * D / G0
+    t_hr = W_fuel_kg / fuel_flow_kg_hr
+
+    return {
+        "V_ms": V_ms,
+        "Wi_kg": Wi,
+        "Wf_kg": Wf,
+        "W_pax_kg": W_pax,
+        "range_km": R * M_TO_KM,
+        "range_nm": R * M_TO_NM,
+        "endurance_hr": endurance_hr,
+        "CL": CL,
+        "CD": CD,
+        "drag_N": D,
+        "fuel_flow_kg_hr": fuel_flow_kg_hr,
+        "fuel_burn_time_hr": t_hr,
+        "fuel_burn_time_min": t_hr * 60.0,
+    }
+
+
+def mission_estimate(
+    Wi_kg: float,
+    fuel_weight_kg: float,
+    cruise_speed_ms: float,
+    c_per_hr: float,
+    LD: float,
+) -> dict:
+    """Same payload as POST /api/mission-planner/estimate."""
+    if cruise_speed_ms <= 0 or c_per_hr <= 0 or LD <= 0:
+        raise ValueError("Cruise speed, SFC and L/D must be positive.")
+
+    Wf = Wi_kg - fuel_weight_kg
+    _check_weights(Wi_kg, Wf)
+
+    R = breguet_range_m(cruise_speed_ms, c_per_hr, LD, Wi_kg, Wf)
+    return {
+        "Wi_kg": Wi_kg,
+        "Wf_kg": Wf,
+        "fuel_weight_kg": fuel_weight_kg,
+        "range_km": R * M_TO_KM,
+        "range_nm": R * M_TO_NM,
+        "range_mi": R * M_TO_MI,
+        "time_hr": R / cruise_speed_ms / 3600.0,
+    }
+
+
+# -------------------------
+# Batch (columnar) versions
+# -------------------------
+# Inputs are arrays or scalars broadcast against each other; outputs are
+# dicts of equally long NumPy columns. Points a scalar function would reject
+# (out-of-range altitude, non-positive speed/SFC/L/D/geometry, bad weights)
+# get NaN outputs instead of raising.
+FLOW_REGIMES = np.array(["Subsonic", "Transonic", "Supersonic", "Hypersonic"])
+
+
+def _columns(*values):
+    return [np.ravel(v).astype(float) for v in np.broadcast_arrays(*values)]
+
+
+def isa_properties_batch(altitude_m) -> dict:
+    """Columnar /api/isa/batch payload."""
+    (h,) = _columns(altitude_m)
+    T, P, rho, a = isa_atmosphere_array(h)
+    return {
+        "altitude_m": h,
+        "temperature_K": T,
+        "pressure_Pa": P,
+        "density_kg_m3": rho,
+        "speed_of_sound_m_s": a,
+    }
+
+
+def mach_properties_batch(altitude_m, speed_value, speed_unit: str = "m/s") -> dict:
+    """Columnar /api/mach/batch payload (one speed unit per batch)."""
+    if speed_unit not in SPEED_TO_MS:
+        raise ValueError(
+            f"Invalid speed_unit '{speed_unit}'. Use 'm/s', 'ft/s', or 'knots'."
+        )
+
+    h, v = _columns(altitude_m, speed_value)
+    T, _, _, a = isa_atmosphere_array(h)
+    V = v * SPEED_TO_MS[speed_unit]
+    mach = V / a
+
+    regime = np.searchsorted([0.8, 1.2, 5.0], mach, side="right")
+    regime = np.where(np.isnan(mach), "", FLOW_REGIMES[np.minimum(regime, 3)])
+    return {
+        "altitude_m": h,
+        "speed_m_s": V,
+        "speed_of_sound_m_s": a,
+        "temperature_K": T,
+        "mach": mach,
+        "flow_regime": regime,
+    }
+
+
+def _valid(*conditions):
+    """1.0 where every condition holds, NaN elsewhere (multiply outputs by it)."""
+    return np.where(np.logical_and.reduce(conditions), 1.0, np.nan)
+
+
+def fuel_range_estimate_batch(
+    V_ms, pax, pax_wt_kg, W_empty_kg, W_fuel_kg, c_per_hr, LD, S_m2, b_m, CD0, e,
+    altitude_m=DEFAULT_CRUISE_ALTITUDE_M,
+) -> dict:
+    """Columnar /api/fuel-range/batch payload; same model as fuel_range_estimate."""
+    V, pax, pax_wt, W_empty, W_fuel, c, LD, S, b, CD0, e, h = _columns(
+        V_ms, pax, pax_wt_kg, W_empty_kg, W_fuel_kg, c_per_hr, LD, S_m2, b_m, CD0, e, altitude_m
+    )
+
+    W_pax = pax * pax_wt
+    Wi = W_empty + W_fuel + W_pax
+    Wf = Wi - W_fuel
+    # same checks as fuel_range_estimate
+    ok = _valid(V > 0, c > 0, LD > 0, S > 0, b > 0, e > 0, CD0 >= 0, Wf > 0, Wi > Wf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ln_w = np.log(Wi / Wf) * ok
+        R = V / (c / 3600.0) * LD * ln_w
+        endurance_hr = LD / c * ln_w
+
+        rho = isa_atmosphere_array(h)[2]
+        q = 0.5 * rho * V ** 2
+        CL = 0.5 * (Wi + Wf) * G0 / (q * S) * ok
+        CD = CD0 + CL ** 2 / (np.pi * e * b ** 2 / S)
+        D = q * S * CD
+        fuel_flow = c * D / G0
+        t_hr = W_fuel / fuel_flow
+
+    return {
+        "V_ms": V,
+        "Wi_kg": Wi,
+        "Wf_kg": Wf,
+        "W_pax_kg": W_pax,
+        "range_km": R * M_TO_KM,
+        "range_nm": R * M_TO_NM,
+        "endurance_hr": endurance_hr,
+        "CL": CL,
+        "CD": CD,
+        "drag_N": D,
+        "fuel_flow_kg_hr": fuel_flow,
+        "fuel_burn_time_hr": t_hr,
+        "fuel_burn_time_min": t_hr * 60.0,
+    }
+
+
+def mission_estimate_batch(Wi_kg, fuel_weight_kg, cruise_speed_ms, c_per_hr, LD) -> dict:
+    """Columnar /api/mission-planner/batch payload."""
+    Wi, fuel, V, c, LD = _columns(Wi_kg, fuel_weight_kg, cruise_speed_ms, c_per_hr, LD)
+
+    Wf = Wi - fuel
+    # same checks as mission_estimate
+    ok = _valid(V > 0, c > 0, LD > 0, Wf > 0, Wi > Wf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = V / (c / 3600.0) * LD * np.log(Wi / Wf) * ok
+        time_hr = R / V / 3600.0
+
+    return {
+        "Wi_kg": Wi,
+        "Wf_kg": Wf,
+        "fuel_weight_kg": fuel,
+        "range_km": R * M_TO_KM,
+        "range_nm": R * M_TO_NM,
+        "range_mi": R * M_TO_MI,
+        "time_hr": time_hr,
+    }
+
+
+# -------------------------
+# Lift / drag envelope
+# -------------------------
+def lift_drag_grid(altitude_m, speed_ms, weight_N, S_m2: float, b_m: float, CD0: float, e: float) -> dict:
+    """
+    Level-flight (L = W) aerodynamics on an altitude x airspeed x weight grid.
+
+    One ISA evaluation per altitude, then every quantity is a broadcast over
+    axes (altitude, speed, weight); each array is shaped (n_alt, n_speed,
+    n_weight). Also returns the analytic L/D-max speed per altitude/weight.
+    """
+    h = np.asarray(altitude_m, dtype=float).reshape(-1, 1, 1)
+    V = np.asarray(speed_ms, dtype=float).reshape(1, -1, 1)
+    W = np.asarray(weight_N, dtype=float).reshape(1, 1, -1)
+
+    rho = isa_atmosphere_array(h)[2]
+    AR = b_m ** 2 / S_m2
+    k = 1.0 / (math.pi * e * AR)
+
+    q = 0.5 * rho * V ** 2
+    CL = W / (q * S_m2)
+    CD = CD0 + k * CL ** 2
+    D = q * S_m2 * CD
+
+    # L/D max needs some parasite drag; without it the optimum is at V -> 0
+    if CD0 > 0:
+        LD_max = 0.5 / math.sqrt(CD0 * k)
+        V_LD_max = np.sqrt(2.0 * W / (rho * S_m2) * math.sqrt(k / CD0))[:, 0, :]
+    else:
+        LD_max = math.inf
+        V_LD_max = np.full((h.size, W.size), np.nan)
+
+    return {
+        "altitude_m": h.ravel(),
+        "speed_m_s": V.ravel(),
+        "weight_N": W.ravel(),
+        "density_kg_m3": rho.ravel(),
+        "AR": AR,
+        "k": k,
+        "q_Pa": q,
+        "CL": CL,
+        "CD": CD,
+        "drag_N": D,
+        "L_D": CL / CD,
+        "power_W": D * V,
+        "LD_max": LD_max,
+        "V_LD_max_m_s": V_LD_max,
+    }
@@ -0,0 +1,186 @@
+# response_cache.py
+"""
+Response cache for the AI assistant (Streamlit tool and the /ask endpoint).
+
+Exact tier: an in-memory LRU with a TTL, keyed on a hash of the system
+prompt (so editing the prompt invalidates old answers), the conversation
+context and the normalized question. "What is ISA?" and "what is  ISA"
+hit the same entry.
+
+Optional similarity tier, off by default: when an `embed` function is
+given, a miss on the exact key falls back to the most similar cached
+question with the same system prompt, context and numbers ("... at 10 km"
+never answers "... at 11 km"), if its cosine similarity is >= `threshold`.
+It needs a semantic embedding model (see openai_embedding): lexical
+similarity cannot tell "troposphere" from "stratosphere", so a
+character-level hash would hand out wrong answers. The threshold may not
+go below MIN_SIMILARITY_THRESHOLD.
+
+Run as a script for a demo against a local stub model:
+    python response_cache.py
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+
+DEFAULT_TTL_S = 24 * 3600
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_THRESHOLD = 0.95
+MIN_SIMILARITY_THRESHOLD = 0.93
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def normalize_prompt(text: str) -> str:
+    """Casefold, strip accents, collapse whitespace and trailing punctuation."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = " ".join(text.casefold().split())
+    return text.rstrip(" ?!.")
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def prompt_numbers(text: str) -> tuple:
+    return tuple(re.findall(r"\d+(?:\.\d+)?", normalize_prompt(text)))
+
+
+def openai_embedding(client, model: str = DEFAULT_EMBEDDING_MODEL):
+    """
+    embed(text) -> unit vector, using an OpenAI-compatible embeddings API
+    (a synchronous client). Called on every similarity lookup and put.
+    """
+    def embed(text: str) -> np.ndarray:
+        resp = client.embeddings.create(model=model, input=normalize_prompt(text))
+        vec = np.asarray(resp.data[0].embedding, dtype=float)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+    return embed
+
+
+class ResponseCache:
+    def __init__(self, ttl_s: float = DEFAULT_TTL_S, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 embed=None, threshold: float = DEFAULT_THRESHOLD):
+        """embed=None (default) keeps the cache exact-match only."""
+        if embed is not None and threshold < MIN_SIMILARITY_THRESHOLD:
+            raise ValueError(f"Similarity threshold must be >= {MIN_SIMILARITY_THRESHOLD}.")
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.embed = embed
+        self.threshold = threshold
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+        # key -> (answer, stored_at, scope, numbers, embedding or None)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def scope(system_prompt: str, context: str = "") -> str:
+        """Entries are only comparable within one system prompt + context."""
+        return _digest(system_prompt, context)
+
+    def _key(self, scope: str, prompt: str) -> str:
+        return _digest(scope, normalize_prompt(prompt))
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl_s
+
+    def get(self, prompt: str, system_prompt: str, context: str = ""):
+        """Cached answer or None."""
+        scope = self.scope(system_prompt, context)
+        key = self._key(scope, prompt)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[1], now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+
+        if self.embed is not None:
+            answer = self._similar(scope, prompt_numbers(prompt), self.embed(prompt), now)
+            if answer is not None:
+                return answer
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _similar(self, scope: str, numbers: tuple, vec: np.ndarray, now: float):
+        with self._lock:
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if e[2] == scope and e[3] == numbers and e[4] is not None
+                and not self._expired(e[1], now)
+            ]
+            if not candidates:
+                return None
+            scores = np.stack([e[4] for _, e in candidates]) @ vec
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            key, entry = candidates[best]
+            self._entries.move_to_end(key)
+            self.similar_hits += 1
+            return entry[0]
+
+    def put(self, prompt: str, answer: str, system_prompt: str, context: str = ""):
+        scope = self.scope(system_prompt, context)
+        key = self._key(scope, prompt)
+        vec = self.embed(prompt) if self.embed is not None else None
+        with self._lock:
+            self._entries[key] = (answer, time.time(), scope, prompt_numbers(prompt), vec)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, prompt: str, system_prompt: str, compute, context: str = ""):
+        """Cached answer, or compute() stored and returned. -> (answer, hit)"""
+        answer = self.get(prompt, system_prompt, context)
+        if answer is not None:
+            return answer, True
+        answer = compute()
+        self.put(prompt, answer, system_prompt, context)
+        return answer, False
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.similar_hits + self.misses
+            return {
+                "hits": self.hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.similar_hits) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+if __name__ == "__main__":
+    def stub_model(prompt: str) -> str:
+        time.sleep(1.5)   # stands in for a multi-second completion
+        return f"(stub answer to: {prompt})"
+
+    cache = ResponseCache()
+    system = "You are ISA AI."
+    for question in ["What is the ISA lapse rate?", "what is the isa lapse rate", "What is the ISA LAPSE rate!"]:
+        start = time.perf_counter()
+        _, hit = cache.get_or_compute(question, system, lambda: stub_model(question))
+        print(f"{'hit ' if hit else 'miss'} {1000 * (time.perf_counter() - start):8.2f} ms  {question}")
+    print(cache.stats())
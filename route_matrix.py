@@ -0,0 +1,248 @@
+# route_matrix.py
+"""
+Batch route feasibility: N origins x M destinations x every fleet aircraft.
+
+Distances come from a vectorized Vincenty (WGS-84) kernel, with haversine
+as a faster option, and each route is scored with fleet.evaluate_routes.
+Results can be saved as a compact .npz or as a long Parquet table.
+
+Example:
+    python route_matrix.py --origins origins.txt --destinations dests.txt -o out.parquet
+
+Input files hold one city name, ICAO/IATA code or "lat,lon" per line;
+names are resolved offline with airport_index.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from airport_index import load_airport_index
+from fleet import FLEET, evaluate_routes
+
+
+EARTH_RADIUS_KM = 6371.0088   # mean Earth radius
+
+# WGS-84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance on a sphere; inputs broadcast like NumPy arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=float)) for x in (lat1, lon1, lat2, lon2))
+    h = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def _vincenty_lambda_step(lam, L, sinU1, cosU1, sinU2, cosU2):
+    """One Vincenty iteration; returns the new lambda and the terms the distance needs."""
+    f = WGS84_F
+    sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+    sin_sigma = np.hypot(cosU2 * sin_lam, cosU1 * sinU2 - sinU1 * cosU2 * cos_lam)
+    cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+    sigma = np.arctan2(sin_sigma, cos_sigma)
+    sin_alpha = np.where(sin_sigma == 0, 0.0, cosU1 * cosU2 * sin_lam / sin_sigma)
+    cos2_alpha = 1 - sin_alpha ** 2
+    # equatorial lines have cos2_alpha = 0
+    cos_2sigma_m = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha)
+    C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+    lam_new = L + (1 - C) * f * sin_alpha * (
+        sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+    )
+    return lam_new, (sin_sigma, cos_sigma, sigma, cos2_alpha, cos_2sigma_m)
+
+
+def vincenty_km(lat1, lon1, lat2, lon2, iterations: int = 100, tol: float = 1e-12) -> np.ndarray:
+    """
+    Vincenty inverse distance on the WGS-84 ellipsoid, vectorized.
+
+    Only pairs that have not converged yet are iterated again. The few
+    nearly antipodal pairs where Vincenty does not converge fall back to
+    haversine (within ~0.5%).
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (lat1, lon1, lat2, lon2)))
+    shape = arrays[0].shape
+    lat1, lon1, lat2, lon2 = (a.ravel() for a in arrays)
+    f = WGS84_F
+
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    L = np.radians(lon2 - lon1)
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L.copy()
+    terms = [np.full(L.shape, np.nan) for _ in range(5)]
+    active = np.flatnonzero(np.isfinite(L))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(iterations):
+            if active.size == 0:
+                break
+            lam_new, step_terms = _vincenty_lambda_step(
+                lam[active], L[active], sinU1[active], cosU1[active], sinU2[active], cosU2[active]
+            )
+            for full, part in zip(terms, step_terms):
+                full[active] = part
+            done = np.abs(lam_new - lam[active]) < tol
+            lam[active] = lam_new
+            active = active[~done]
+
+        sin_sigma, cos_sigma, sigma, cos2_alpha, cos_2sigma_m = terms
+        u2 = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        delta_sigma = B * sin_sigma * (
+            cos_2sigma_m
+            + B / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+            )
+        )
+        s_km = WGS84_B * A * (sigma - delta_sigma) / 1000.0
+
+    # not converged (nearly antipodal): spherical fallback
+    if active.size:
+        s_km[active] = haversine_km(lat1[active], lon1[active], lat2[active], lon2[active])
+    return s_km.reshape(shape)
+
+
+DISTANCE_KERNELS = {
+    "vincenty": vincenty_km,
+    "haversine": haversine_km,
+}
+
+
+def _parse_lat_lon(text: str):
+    parts = text.split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        return float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+
+
+_default_index = None
+
+
+def get_airport_index():
+    """Process-wide offline index; airports.min.json is parsed on first use only."""
+    global _default_index
+    if _default_index is None:
+        _default_index = load_airport_index()
+    return _default_index
+
+
+def resolve_places(places, index=None) -> np.ndarray:
+    """
+    (n, 2) array of lat/lon for a list of names, codes, "lat,lon" strings or
+    (lat, lon) pairs. Places that cannot be resolved offline are NaN.
+    Names are looked up in `index` (default: get_airport_index()).
+    """
+    coords = np.full((len(places), 2), np.nan)
+    for i, place in enumerate(places):
+        if not isinstance(place, str):
+            coords[i] = place
+            continue
+
+        found = _parse_lat_lon(place)
+        if found is None:
+            if index is None:
+                index = get_airport_index()
+            found = index.resolve(place)
+        if found is not None:
+            coords[i] = found
+    return coords
+
+
+def route_matrix(origins, destinations, fleet: pd.DataFrame = FLEET, method: str = "vincenty",
+                 index=None) -> dict:
+    """
+    Distance and fleet feasibility for every origin/destination pair.
+    Names are resolved with `index` (default: the shared get_airport_index()).
+
+    Returns a dict with
+        origins, destinations, aircraft   labels
+        distance_km                       (N, M)
+        feasible                          (N, M, K) bool
+        fuel_needed_kg, time_hr           (N, M, K) float32, NaN if infeasible
+    Pairs with an unresolved place have NaN distance and are never feasible.
+    """
+    if method not in DISTANCE_KERNELS:
+        raise ValueError(f"Unknown method '{method}'. Use one of {sorted(DISTANCE_KERNELS)}.")
+
+    orig = resolve_places(origins, index)
+    dest = resolve_places(destinations, index)
+
+    distance_km = DISTANCE_KERNELS[method](
+        orig[:, None, 0], orig[:, None, 1], dest[None, :, 0], dest[None, :, 1]
+    )
+
+    scores = evaluate_routes(distance_km.ravel(), fleet)
+    shape = distance_km.shape + (len(fleet),)
+    return {
+        "origins": [str(o) for o in origins],
+        "destinations": [str(d) for d in destinations],
+        "aircraft": list(fleet["name"]),
+        "distance_km": distance_km,
+        "feasible": scores["feasible"].reshape(shape),
+        "fuel_needed_kg": scores["fuel_needed_kg"].reshape(shape).astype(np.float32),
+        "time_hr": scores["time_hr"].reshape(shape).astype(np.float32),
+    }
+
+
+def to_table(result: dict, feasible_only: bool = True) -> pd.DataFrame:
+    """Long table, one row per (origin, destination, aircraft); labels are categoricals."""
+    n, m, k = result["feasible"].shape
+    oi, di, ai = np.meshgrid(np.arange(n), np.arange(m), np.arange(k), indexing="ij")
+
+    df = pd.DataFrame(
+        {
+            "origin": pd.Categorical(np.asarray(result["origins"])[oi.ravel()]),
+            "destination": pd.Categorical(np.asarray(result["destinations"])[di.ravel()]),
+            "aircraft": pd.Categorical.from_codes(ai.ravel(), result["aircraft"]),
+            "distance_km": np.repeat(result["distance_km"].astype(np.float32).ravel(), k),
+            "feasible": result["feasible"].ravel(),
+            "fuel_needed_kg": result["fuel_needed_kg"].ravel(),
+            "time_hr": result["time_hr"].ravel(),
+        }
+    )
+    if feasible_only:
+        df = df[df["feasible"]].reset_index(drop=True)
+    return df
+
+
+def save(result: dict, path: str):
+    """Write `result` as .npz (dense arrays) or .parquet (long table)."""
+    if path.endswith(".parquet"):
+        to_table(result).to_parquet(path, index=False)
+    elif path.endswith(".npz"):
+        np.savez_compressed(path, **{k: np.asarray(v) for k, v in result.items()})
+    else:
+        raise ValueError("Output must end with .parquet or .npz")
+
+
+def _read_places(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="All-pairs route feasibility for the fleet.")
+    parser.add_argument("--origins", required=True, help="file with one place per line")
+    parser.add_argument("--destinations", required=True, help="file with one place per line")
+    parser.add_argument("-o", "--output", required=True, help="output .parquet or .npz")
+    parser.add_argument("--method", default="vincenty", choices=sorted(DISTANCE_KERNELS))
+    args = parser.parse_args()
+
+    result = route_matrix(_read_places(args.origins), _read_places(args.destinations), method=args.method)
+    save(result, args.output)
+
+    n, m, _ = result["feasible"].shape
+    print(f"Wrote {n} x {m} routes x {len(result['aircraft'])} aircraft to {args.output}")
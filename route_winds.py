@@ -0,0 +1,331 @@
+# route_winds.py
+"""
+Wind-aware route time and fuel.
+
+Instead of fleet.EFFECTIVE_SPEED_FACTOR (a flat 0.85 x cruise speed), each
+route's great circle is cut into N equal segments, the wind at the cruise
+pressure level is read at every segment midpoint from a gridded u/v field
+(bilinear, longitude wraps), and the ground speed along track
+
+    GS = sqrt(TAS^2 - crosswind^2) + tailwind
+
+is integrated over the segments. Everything is array math over
+(routes, waypoints, aircraft), so thousands of routes score per second,
+and the grid is a local .npz file, so it works offline.
+
+Build a grid from Open-Meteo (one-off, needs network), then benchmark:
+    python route_winds.py build -o winds_aloft.npz --step 5
+    python route_winds.py bench -n 10000
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+import http_client
+from fleet import FLEET, evaluate_routes
+from route_matrix import haversine_km
+from utils import isa_atmosphere_array
+
+
+DEFAULT_WAYPOINTS = 32
+DEFAULT_CRUISE_ALTITUDE_M = 10668.0   # FL350
+GRID_LEVELS_HPA = (850, 700, 500, 400, 300, 250, 200)
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+LOCATIONS_PER_REQUEST = 100
+MAX_MISSING_SHARE = 0.05   # per level; fetch_grid fills up to this from neighbours
+
+
+# -------------------------
+# Wind grid
+# -------------------------
+class WindGrid:
+    """
+    u (eastward) and v (northward) wind in m/s on a regular lat/lon grid,
+    shaped (n_levels, n_lat, n_lon). lat ascends from lat[0]; lon starts
+    at lon[0] and covers the globe.
+    """
+
+    def __init__(self, lat, lon, levels_hpa, u, v, valid_time: str = ""):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.levels_hpa = np.asarray(levels_hpa, dtype=float)
+        self.u = np.asarray(u, dtype=np.float32)
+        self.v = np.asarray(v, dtype=np.float32)
+        self.valid_time = valid_time
+
+        shape = (len(self.levels_hpa), len(self.lat), len(self.lon))
+        if self.u.shape != shape or self.v.shape != shape:
+            raise ValueError(f"u and v must be shaped (levels, lat, lon) = {shape}")
+        self.dlat = self.lat[1] - self.lat[0]
+        self.dlon = 360.0 / len(self.lon)
+
+    @classmethod
+    def load(cls, path: str) -> "WindGrid":
+        with np.load(path) as f:
+            return cls(f["lat"], f["lon"], f["levels_hpa"], f["u"], f["v"], str(f["valid_time"]))
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path, lat=self.lat, lon=self.lon, levels_hpa=self.levels_hpa,
+            u=self.u, v=self.v, valid_time=np.array(self.valid_time),
+        )
+
+    @classmethod
+    def synthetic(cls, step_deg: float = 5.0, levels_hpa=GRID_LEVELS_HPA) -> "WindGrid":
+        """Idealized westerly jets near 35° N/S, strongest at 250 hPa. For demos and benchmarks."""
+        lat = np.arange(-90.0, 90.0 + step_deg / 2, step_deg)
+        lon = np.arange(-180.0, 180.0, step_deg)
+        levels = np.asarray(levels_hpa, dtype=float)
+        jet = 45.0 * np.exp(-(((np.abs(lat) - 35.0) / 12.0) ** 2))              # m/s by latitude
+        strength = np.exp(-((np.log(levels / 250.0) / 0.6) ** 2))                # by level
+        u = strength[:, None, None] * jet[None, :, None] * np.ones((1, 1, lon.size))
+        return cls(lat, lon, levels, u, np.zeros_like(u), "synthetic")
+
+    def level_index(self, cruise_altitude_m: float) -> int:
+        """Grid level closest (in log-pressure) to the ISA pressure at the cruise altitude."""
+        P_hpa = float(isa_atmosphere_array(cruise_altitude_m)[1]) / 100.0
+        if not np.isfinite(P_hpa):
+            raise ValueError("Cruise altitude must be within 0–47 km.")
+        return int(np.argmin(np.abs(np.log(self.levels_hpa / P_hpa))))
+
+    def sample(self, lat, lon, level: int):
+        """Bilinear (u, v) at arrays of points on one level."""
+        fi = np.clip((np.asarray(lat) - self.lat[0]) / self.dlat, 0.0, len(self.lat) - 1.0)
+        fj = ((np.asarray(lon) - self.lon[0]) % 360.0) / self.dlon
+
+        i0 = np.minimum(fi.astype(np.intp), len(self.lat) - 2)
+        j0 = fj.astype(np.intp) % len(self.lon)
+        j1 = (j0 + 1) % len(self.lon)
+        ti, tj = fi - i0, fj - np.floor(fj)
+
+        def interp(field):
+            f = field[level]
+            top = f[i0 + 1, j0] * (1 - tj) + f[i0 + 1, j1] * tj
+            bottom = f[i0, j0] * (1 - tj) + f[i0, j1] * tj
+            return bottom * (1 - ti) + top * ti
+
+        return interp(self.u), interp(self.v)
+
+
+# -------------------------
+# Route integration
+# -------------------------
+def _unit_vectors(lat, lon):
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def great_circle_waypoints(lat1, lon1, lat2, lon2, n: int = DEFAULT_WAYPOINTS):
+    """
+    Midpoints of n equal great-circle segments and the track there.
+    Inputs shaped (n_routes,); returns lat, lon, track (deg true) shaped
+    (n_routes, n).
+    """
+    lat1, lon1, lat2, lon2 = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (lat1, lon1, lat2, lon2))
+    p1, p2 = _unit_vectors(lat1, lon1), _unit_vectors(lat2, lon2)
+    omega = np.arccos(np.clip(np.sum(p1 * p2, axis=-1), -1.0, 1.0))[:, None]
+
+    f = (np.arange(n) + 0.5) / n
+    sin_omega = np.sin(omega)
+    small = sin_omega < 1e-12   # same point: any weights on the chord do
+    a = np.where(small, 1.0 - f, np.sin((1.0 - f) * omega) / np.where(small, 1.0, sin_omega))
+    b = np.where(small, f, np.sin(f * omega) / np.where(small, 1.0, sin_omega))
+    p = a[..., None] * p1[:, None, :] + b[..., None] * p2[:, None, :]
+    p /= np.linalg.norm(p, axis=-1, keepdims=True)
+
+    phi = np.arcsin(np.clip(p[..., 2], -1.0, 1.0))
+    lam = np.arctan2(p[..., 1], p[..., 0])
+
+    # course from each midpoint towards the destination = great-circle track
+    phi2, lam2 = np.radians(lat2)[:, None], np.radians(lon2)[:, None]
+    track = np.arctan2(
+        np.sin(lam2 - lam) * np.cos(phi2),
+        np.cos(phi) * np.sin(phi2) - np.sin(phi) * np.cos(phi2) * np.cos(lam2 - lam),
+    )
+    return np.degrees(phi), np.degrees(lam), np.degrees(track) % 360.0
+
+
+def route_wind_times(lat1, lon1, lat2, lon2, tas_ms, grid: WindGrid,
+                     cruise_altitude_m: float = DEFAULT_CRUISE_ALTITUDE_M,
+                     n_waypoints: int = DEFAULT_WAYPOINTS, distances_km=None) -> dict:
+    """
+    Time and still-air distance for every route x aircraft.
+
+    Args:
+        lat1, lon1, lat2, lon2: route ends in degrees, shape (n_routes,).
+        tas_ms: true airspeed per aircraft, shape (n_aircraft,).
+        distances_km: route lengths if already known (e.g. ellipsoidal);
+            haversine otherwise.
+
+    Returns time_hr and air_km shaped (n_routes, n_aircraft), plus the
+    mean along-track wind (+ tailwind) in m/s per route. Time is NaN where
+    the wind exceeds the airspeed.
+    """
+    if distances_km is None:
+        distances_km = haversine_km(lat1, lon1, lat2, lon2)
+    seg_m = np.atleast_1d(np.asarray(distances_km, dtype=float))[:, None] * 1000.0 / n_waypoints
+
+    lat, lon, track = great_circle_waypoints(lat1, lon1, lat2, lon2, n_waypoints)
+    u, v = grid.sample(lat, lon, grid.level_index(cruise_altitude_m))
+    trk = np.radians(track)
+    along = u * np.sin(trk) + v * np.cos(trk)     # (routes, waypoints)
+    cross = u * np.cos(trk) - v * np.sin(trk)
+
+    tas = np.atleast_1d(np.asarray(tas_ms, dtype=float))
+    gs = np.sqrt(np.maximum(tas ** 2 - cross[..., None] ** 2, 0.0)) + along[..., None]
+    with np.errstate(divide="ignore"):
+        seconds = np.sum(np.where(gs > 0, seg_m[..., None] / gs, np.nan), axis=1)
+
+    return {
+        "time_hr": seconds / 3600.0,
+        "air_km": seconds * tas / 1000.0,
+        "wind_component_ms": along.mean(axis=1),
+    }
+
+
+def evaluate_routes_with_wind(lat1, lon1, lat2, lon2, grid: WindGrid, fleet=FLEET,
+                              cruise_altitude_m: float = DEFAULT_CRUISE_ALTITUDE_M,
+                              n_waypoints: int = DEFAULT_WAYPOINTS, distances_km=None) -> dict:
+    """fleet.evaluate_routes with wind-corrected time, fuel and feasibility."""
+    if distances_km is None:
+        distances_km = haversine_km(lat1, lon1, lat2, lon2)
+    winds = route_wind_times(
+        lat1, lon1, lat2, lon2, fleet["cruise_speed"].to_numpy(), grid,
+        cruise_altitude_m, n_waypoints, distances_km,
+    )
+    result = evaluate_routes(distances_km, fleet, air_km=winds["air_km"], time_hr=winds["time_hr"])
+    result["wind_component_ms"] = winds["wind_component_ms"]
+    return result
+
+
+# -------------------------
+# Grid download
+# -------------------------
+def fill_from_neighbours(field: np.ndarray) -> int:
+    """
+    Fill NaN cells of a (levels, lat, lon) field in place with the mean of
+    their valid 4-neighbours (longitude wraps), growing inwards until every
+    gap is closed. Returns the number of cells filled; raises ValueError if
+    a level has no valid cell to fill from.
+    """
+    filled = 0
+    for level in field:
+        missing = np.isnan(level)
+        if missing.all():
+            raise ValueError("A wind level has no valid cells to fill from.")
+        while missing.any():
+            rows = np.pad(level, ((1, 1), (0, 0)), constant_values=np.nan)
+            neighbours = np.stack([
+                rows[:-2], rows[2:],                                   # south, north
+                np.roll(level, 1, axis=1), np.roll(level, -1, axis=1),  # west, east
+            ])
+            valid = ~np.isnan(neighbours)
+            count = valid.sum(axis=0)
+            fill = missing & (count > 0)
+            mean = np.where(valid, neighbours, 0.0).sum(axis=0) / np.maximum(count, 1)
+            level[fill] = mean[fill]
+            missing &= ~fill
+            filled += int(fill.sum())
+    return filled
+
+
+def fetch_grid(step_deg: float = 10.0, levels_hpa=GRID_LEVELS_HPA) -> WindGrid:
+    """
+    Current-hour winds from Open-Meteo on a global step_deg grid (many
+    locations per request). Needs network; the result is meant to be saved.
+
+    Cells the API returns no speed/direction for are not treated as calm:
+    up to MAX_MISSING_SHARE of a level is filled from neighbouring cells
+    (fill_from_neighbours), more than that fails the build with ValueError.
+    """
+    lat = np.arange(-90.0, 90.0 + step_deg / 2, step_deg)
+    lon = np.arange(-180.0, 180.0, step_deg)
+    points = [(a, b) for a in lat for b in lon]
+    hour = datetime.now(timezone.utc).hour
+    u = np.full((len(levels_hpa), len(points)), np.nan)
+    v = np.full_like(u, np.nan)
+
+    for start in range(0, len(points), LOCATIONS_PER_REQUEST):
+        chunk = points[start:start + LOCATIONS_PER_REQUEST]
+        r = http_client.get(
+            FORECAST_URL,
+            endpoint="weather",
+            params={
+                "latitude": ",".join(f"{a:g}" for a, _ in chunk),
+                "longitude": ",".join(f"{b:g}" for _, b in chunk),
+                "hourly": ",".join(f"windspeed_{L}hPa,winddirection_{L}hPa" for L in levels_hpa),
+                "wind_speed_unit": "ms",
+                "forecast_days": 1,
+                "timezone": "GMT",
+            },
+        )
+        r.raise_for_status()
+        data = r.json()
+        for k, loc in enumerate(data if isinstance(data, list) else [data]):
+            for li, L in enumerate(levels_hpa):
+                speed = loc["hourly"][f"windspeed_{L}hPa"][hour]
+                direction = loc["hourly"][f"winddirection_{L}hPa"][hour]
+                if speed is None or direction is None:
+                    continue   # stays NaN
+                direction = np.radians(direction)
+                # meteorological direction is where the wind comes from
+                u[li, start + k] = -speed * np.sin(direction)
+                v[li, start + k] = -speed * np.cos(direction)
+
+    shape = (len(levels_hpa), lat.size, lon.size)
+    u, v = u.reshape(shape), v.reshape(shape)
+    missing = np.isnan(u).mean(axis=(1, 2))
+    if missing.max() > MAX_MISSING_SHARE:
+        worst = int(np.argmax(missing))
+        raise ValueError(
+            f"Open-Meteo returned no wind for {missing[worst]:.0%} of the "
+            f"{levels_hpa[worst]} hPa grid (limit {MAX_MISSING_SHARE:.0%}); not building."
+        )
+    fill_from_neighbours(u)
+    fill_from_neighbours(v)
+
+    valid = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:00Z")
+    return WindGrid(lat, lon, levels_hpa, u, v, valid)
+
+
+def benchmark(n_routes: int = 10_000, repeat: int = 5, n_waypoints: int = DEFAULT_WAYPOINTS,
+              grid: WindGrid = None) -> float:
+    """Routes per second for evaluate_routes_with_wind over random city pairs."""
+    grid = grid or WindGrid.synthetic()
+    rng = np.random.default_rng(0)
+    lat1, lat2 = rng.uniform(-60, 70, (2, n_routes))
+    lon1, lon2 = rng.uniform(-180, 180, (2, n_routes))
+
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        evaluate_routes_with_wind(lat1, lon1, lat2, lon2, grid, n_waypoints=n_waypoints)
+        best = min(best, time.perf_counter() - start)
+    return n_routes / best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wind-aware route engine: build a wind grid or benchmark.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="download current winds aloft from Open-Meteo")
+    build.add_argument("-o", "--output", default="winds_aloft.npz")
+    build.add_argument("--step", type=float, default=10.0, help="grid spacing in degrees")
+
+    bench = sub.add_parser("bench", help="routes per second against a grid")
+    bench.add_argument("-n", "--routes", type=int, default=10_000)
+    bench.add_argument("--waypoints", type=int, default=DEFAULT_WAYPOINTS)
+    bench.add_argument("--grid", help=".npz grid (default: synthetic jets)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        grid = fetch_grid(args.step)
+        grid.save(args.output)
+        print(f"Wrote {grid.u.shape} wind grid valid {grid.valid_time} to {args.output}")
+    else:
+        grid = WindGrid.load(args.grid) if args.grid else WindGrid.synthetic()
+        rate = benchmark(args.routes, n_waypoints=args.waypoints, grid=grid)
+        print(f"{rate:,.0f} routes/s x {len(FLEET)} aircraft ({args.waypoints} waypoints, grid {grid.valid_time})")
@@ -0,0 +1,6 @@
+# conftest.py
+# The app modules live at the repository root (no package), like isa_app.py expects.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+# test_airport_index.py
+from airport_index import AirportIndex
+
+
+def airport(icao, city, country, lat, lon, iata=None):
+    return {"icao": icao, "iata": iata, "name": f"{city} {icao}", "city": city,
+            "country": country, "lat": lat, "lon": lon}
+
+
+PORTLANDS = [
+    airport("KPDX", "Portland", "US", 45.5887, -122.5975, "PDX"),
+    airport("KPWM", "Portland", "US", 43.6462, -70.3093, "PWM"),
+    airport("YPOD", "Portland", "AU", -38.3181, 141.4709, "PTJ"),
+]
+
+
+def test_duplicated_city_name_is_ambiguous():
+    index = AirportIndex(PORTLANDS)
+    assert index.resolve("Portland") is None
+    assert index.city_coordinates("portland") is None
+    assert "portland" not in index.all_city_coordinates()
+
+
+def test_codes_still_resolve_for_ambiguous_city():
+    index = AirportIndex(PORTLANDS)
+    assert index.resolve("PDX") == (45.5887, -122.5975)
+    assert index.resolve("KPWM") == (43.6462, -70.3093)
+
+
+def test_city_uses_main_airport_not_mean():
+    index = AirportIndex([
+        airport("00WA", "Seattle", "US", 47.40, -122.10),            # small field, no IATA
+        airport("KSEA", "Seattle", "US", 47.4490, -122.3093, "SEA"),
+        airport("WA09", "Seattle", "US", 47.5300, -122.3019),           # heliport
+    ])
+    assert index.resolve("seattle") == (47.4490, -122.3093)
+    assert index.all_city_coordinates() == {"seattle": (47.4490, -122.3093)}
+
+
+def test_tie_is_independent_of_insertion_order():
+    a = airport("LFPG", "Paris", "FR", 49.0097, 2.5479, "CDG")
+    b = airport("LFPO", "Paris", "FR", 48.7233, 2.3794, "ORY")
+    assert AirportIndex([a, b]).resolve("Paris") == AirportIndex([b, a]).resolve("Paris") == (49.0097, 2.5479)
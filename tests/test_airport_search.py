@@ -0,0 +1,54 @@
+# test_airport_search.py
+import math
+import random
+
+import airport_search
+from airport_search import AirportSearch, trigrams
+
+
+def brute_force_ids(index, query):
+    grams = trigrams(query, partial_last=True)
+    need = max(1, math.ceil(airport_search.MIN_COVERAGE * len(grams)))
+    return {
+        i for i, ap in enumerate(index.airports)
+        if len(grams & trigrams(f"{ap['name']} {ap['city']}")) >= need
+    }
+
+
+def test_common_trigram_probing_matches_brute_force(monkeypatch):
+    monkeypatch.setattr(airport_search, "COMMON_GRAM", 20)
+    rng = random.Random(0)
+    words = ["Lake", "Port", "Santa", "Rosa", "Mill", "Creek", "Fort", "Worth"]
+    airports = [
+        {"icao": f"X{i:03d}", "iata": None, "country": "XX", "lat": 0.0, "lon": 0.0,
+         "name": f"{'Zephyr' if i % 40 == 0 else rng.choice(words)} {rng.choice(words)} "
+                 f"{rng.choice(['Airport', 'Airfield', 'Heliport'])}",
+         "city": rng.choice(words)}
+        for i in range(400)
+    ]
+    index = AirportSearch(airports)
+    assert index._common_row   # the bitset path is exercised
+
+    # a distinctive trigram is needed to reach coverage: exact
+    for query in ["zephyr lake", "zephyr", "zeph"]:
+        ids, _ = index._text_matches(query)
+        assert set(ids.tolist()) == brute_force_ids(index, query), query
+
+    # common trigrams alone can reach coverage: head lists add candidates,
+    # which may miss low-ranked matches but never return non-matches
+    for query in ["zephyr airport", "santa rosa", "fort worth heliport", "airport"]:
+        ids, _ = index._text_matches(query)
+        assert ids.size and set(ids.tolist()) <= brute_force_ids(index, query), query
+
+
+def test_code_and_name_search():
+    index = AirportSearch([
+        {"icao": "KLAX", "iata": "LAX", "name": "Los Angeles International Airport",
+         "city": "Los Angeles", "country": "US", "lat": 33.94, "lon": -118.41},
+        {"icao": "KSFO", "iata": "SFO", "name": "San Francisco International Airport",
+         "city": "San Francisco", "country": "US", "lat": 37.62, "lon": -122.38},
+    ])
+    assert [ap["icao"] for ap in index.search("LAX")] == ["KLAX"]
+    assert index.search("los ang")[0]["icao"] == "KLAX"
+    assert index.search("san fran")[0]["icao"] == "KSFO"
+    assert AirportSearch([]).search("air") == []
@@ -0,0 +1,23 @@
+# test_geocode_cache.py
+import json
+
+from geocode_cache import GeocodeCache
+
+
+def test_seeding_skips_ambiguous_cities_and_drops_old_seeded_rows(tmp_path):
+    airports = tmp_path / "airports.min.json"
+    airports.write_text(json.dumps([
+        {"icao": "KPDX", "iata": "PDX", "name": "", "city": "Portland", "country": "US", "lat": 45.59, "lon": -122.6},
+        {"icao": "KPWM", "iata": "PWM", "name": "", "city": "Portland", "country": "US", "lat": 43.65, "lon": -70.31},
+        {"icao": "KBOS", "iata": "BOS", "name": "", "city": "Boston", "country": "US", "lat": 42.36, "lon": -71.0},
+    ]))
+    cache = GeocodeCache(str(tmp_path / "geocode.sqlite3"))
+    # averaged position written by an older seeding, and a live API answer
+    cache._db.execute("INSERT INTO geocode VALUES ('portland', 44.62, -96.45, 'airports', 0)")
+    cache.put("Springfield", 39.8, -89.6)
+
+    cache.seed_from_airports(str(airports))
+
+    assert cache.get("Portland") is None
+    assert cache.get("Boston") == (42.36, -71.0)
+    assert cache.get("Springfield") == (39.8, -89.6)
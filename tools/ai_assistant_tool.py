@@ -3,6 +3,10 @@
 import streamlit as st
 from groq import Groq
 
+from chat_history import ChatHistory
+from config import AI_CACHE_EMBEDDING_MODEL, AI_CACHE_THRESHOLD, AI_HISTORY_TOKEN_BUDGET
+from response_cache import ResponseCache, openai_embedding
+
 # Use your secret key from Streamlit secrets
 client = Groq(api_key=st.secrets["GROQ_API_KEY"])
 
@@ -41,12 +45,31 @@ IMPORTANT RULES FOR CONSISTENCY:
 """
 
 
+@st.cache_resource
+def get_response_cache() -> ResponseCache:
+    """
+    Answers shared by every session in this process. Exact matches only,
+    unless AI_CACHE_EMBEDDING_MODEL (and OPENAI_API_KEY) opt in to the
+    similarity tier.
+    """
+    if AI_CACHE_EMBEDDING_MODEL and st.secrets.get("OPENAI_API_KEY"):
+        from openai import OpenAI  # optional; only needed for the similarity tier
+
+        embed = openai_embedding(OpenAI(api_key=st.secrets["OPENAI_API_KEY"]), AI_CACHE_EMBEDDING_MODEL)
+        return ResponseCache(embed=embed, threshold=AI_CACHE_THRESHOLD)
+    return ResponseCache()
+
+
 def render():
     st.subheader("🤖 ISA AI Assistant")
 
-    # Keep simple memory in session (optional)
+    # Full transcript for display; the model only gets the token-budgeted
+    # window + rolling summary kept in ai_memory.
     if "ai_history" not in st.session_state:
         st.session_state["ai_history"] = []
+    if "ai_memory" not in st.session_state:
+        st.session_state["ai_memory"] = ChatHistory(AI_HISTORY_TOKEN_BUDGET)
+    memory = st.session_state["ai_memory"]
 
     # Show chat history
     for role, content in st.session_state["ai_history"]:
@@ -62,8 +85,15 @@ def render():
     if not user_input:
         return
 
+    # Answers depend on the conversation so far; key the cache on the last
+    # assistant reply so follow-ups ("why?") only match the same context.
+    last_answer = next(
+        (c for r, c in reversed(st.session_state["ai_history"]) if r == "assistant"), ""
+    )
+
     # Add user message to history
     st.session_state["ai_history"].append(("user", user_input))
+    memory.append("user", user_input)
 
     # Show the user message immediately
     with st.chat_message("user"):
@@ -74,23 +104,37 @@ def render():
         message_placeholder = st.empty()
         message_placeholder.markdown("_Thinking..._")
 
+        cache = get_response_cache()
+
         try:
-            chat_completion = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",  # fast + strong general model
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    *[
-                        {"role": r, "content": c}
-                        for (r, c) in st.session_state["ai_history"]
-                    ],
-                ],
-            )
-
-            answer = chat_completion.choices[0].message.content
-            message_placeholder.markdown(answer)
+            answer = cache.get(user_input, SYSTEM_PROMPT, context=last_answer)
+            if answer is not None:
+                message_placeholder.markdown(answer)
+                st.caption("⚡ Answered from cache")
+            else:
+                # stream tokens into the placeholder as they arrive
+                stream = client.chat.completions.create(
+                    model="llama-3.3-70b-versatile",  # fast + strong general model
+                    messages=memory.messages(SYSTEM_PROMPT),
+                    stream=True,
+                )
+                answer = ""
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        answer += delta
+                        message_placeholder.markdown(answer + "▌")
+                message_placeholder.markdown(answer)
+                cache.put(user_input, answer, SYSTEM_PROMPT, context=last_answer)
 
             # Save assistant reply in history
             st.session_state["ai_history"].append(("assistant", answer))
+            memory.append("assistant", answer)
+
+            with st.sidebar.expander("AI response cache"):
+                st.json(cache.stats())
+            with st.sidebar.expander("AI request size"):
+                st.json(memory.stats(SYSTEM_PROMPT))
 
         except Exception as e:
             message_placeholder.markdown("")
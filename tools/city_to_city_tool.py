@@ -1,64 +1,125 @@
-import math
-import time
+import asyncio
+import os
 
-import pandas as pd
-import requests
 import streamlit as st
 from geopy.distance import geodesic
 
+import http_client
+from airport_index import AirportIndex, load_airport_index
+from fleet import evaluate_route
+from geocode_cache import GeocodeCache
+from route_winds import WindGrid, evaluate_routes_with_wind
+from weather_cache import get_weather_cache
 
-def geocode_city(city_name: str):
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AIRPORTS_PATH = os.path.join(REPO_ROOT, "airports.min.json")
+# built with `python route_winds.py build -o winds_aloft.npz`
+WIND_GRID_PATH = os.path.join(REPO_ROOT, "winds_aloft.npz")
+
+
+@st.cache_resource
+def get_airport_index() -> AirportIndex:
+    """Offline ICAO/IATA/city index built once from airports.min.json."""
+    return load_airport_index(AIRPORTS_PATH)
+
+
+@st.cache_resource
+def get_wind_grid():
+    """Gridded winds aloft from WIND_GRID_PATH, or None (flat speed factor)."""
+    if os.path.exists(WIND_GRID_PATH):
+        return WindGrid.load(WIND_GRID_PATH)
+    return None
+
+
+@st.cache_resource
+def get_geocode_cache() -> GeocodeCache:
+    """Process-wide geocoding cache, pre-seeded from airports.min.json if present."""
+    cache = GeocodeCache()
+    if os.path.exists(AIRPORTS_PATH):
+        cache.seed_from_airports(AIRPORTS_PATH)
+    return cache
+
+
+async def geocode_city(city_name: str, index: AirportIndex, cache: GeocodeCache):
     """
-    Geocode a city name using the free Open-Meteo geocoding API.
+    Geocode a city name (or ICAO/IATA code).
+
+    Resolution order: the offline airport index, the shared geocoding cache,
+    then the free Open-Meteo geocoding API as a fallback (its answers are
+    stored in the cache, so repeated names never reach the network).
 
-    Returns (lat, lon) tuple or None if not found.
+    Runs on the http_client loop, so it reports problems instead of calling
+    Streamlit, and takes the index and cache from the script thread (their
+    st.cache_resource loaders must not run here). SQLite lookups go through
+    a worker thread so they never block the loop.
+    Returns ((lat, lon) or None, error message or None).
     """
+    coords = index.resolve(city_name)
+    if coords is not None:
+        return coords, None
+
+    cached = await asyncio.to_thread(cache.get, city_name)
+    if cached is not None:
+        return cached, None
+
     try:
-        url = (
-            "https://geocoding-api.open-meteo.com/v1/search"
-            f"?name={city_name}&count=1&language=en&format=json"
+        r = await http_client.aget(
+            "https://geocoding-api.open-meteo.com/v1/search",
+            endpoint="geocoding",
+            params={"name": city_name, "count": 1, "language": "en", "format": "json"},
         )
-        r = requests.get(url, timeout=10)
         r.raise_for_status()
         data = r.json()
 
         if "results" in data and len(data["results"]) > 0:
             lat = data["results"][0]["latitude"]
             lon = data["results"][0]["longitude"]
-            return (lat, lon)
-        return None
+            await asyncio.to_thread(cache.put, city_name, lat, lon)
+            return (lat, lon), None
+        return None, None
     except Exception as e:
-        st.error(f"🌐 Geocoding error for '{city_name}': {e}")
-        return None
+        return None, f"🌐 Geocoding error for '{city_name}': {e}"
 
 
-def get_weather(lat: float, lon: float):
+async def get_weather(lat: float, lon: float):
     """
-    Fetch current weather at a given lat/lon using Open-Meteo.
+    Current weather at a given lat/lon from Open-Meteo, through the shared
+    weather snapshot cache (same ~11 km cell and 15-min bucket -> no call).
 
-    Returns a dict with temperature (°C), wind speed (m/s), wind direction (deg),
-    or None on error.
+    Returns (dict with temperature (°C), wind speed (m/s), wind direction
+    (deg) or None, error message or None).
     """
     try:
-        url = (
-            "https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}&current_weather=true"
-        )
-        r = requests.get(url, timeout=8)
-        r.raise_for_status()
-        data = r.json()
+        data, _ = await get_weather_cache().get("current", lat, lon)
         current = data.get("current_weather")
         if not current:
-            return None
+            return None, None
 
         return {
             "temperature_C": current.get("temperature"),
             "windspeed_ms": current.get("windspeed"),
             "winddirection_deg": current.get("winddirection"),
-        }
+        }, None
     except Exception as e:
-        st.warning(f"🌦 Weather lookup failed at ({lat:.2f}, {lon:.2f}): {e}")
-        return None
+        return None, f"🌦 Weather lookup failed at ({lat:.2f}, {lon:.2f}): {e}"
+
+
+async def lookup_end(city_name: str, index: AirportIndex, cache: GeocodeCache) -> dict:
+    """Geocode one end of the route, then fetch its weather."""
+    coords, error = await geocode_city(city_name, index, cache)
+    weather, warning = (None, None)
+    if coords is not None:
+        weather, warning = await get_weather(*coords)
+    return {"coords": coords, "weather": weather, "error": error, "warning": warning}
+
+
+async def lookup_route(departure_city: str, destination_city: str,
+                       index: AirportIndex, cache: GeocodeCache):
+    """Both ends concurrently: latency is the slower chain, not the sum."""
+    return await asyncio.gather(
+        lookup_end(departure_city, index, cache),
+        lookup_end(destination_city, index, cache),
+    )
 
 
 def render():
@@ -69,87 +130,6 @@ def render():
         "**current weather** at each end."
     )
 
-    # --- Aircraft database (very simplified) ---
-    aircraft_data = {
-        "Boeing 737-800": {
-            "cruise_speed": 230,  # m/s
-            "SFC": 0.58,          # 1/hr
-            "LD": 15,
-            "fuel_capacity": 26000,   # kg (approx)
-            "max_takeoff_weight": 79015,
-        },
-        "Boeing 787-9": {
-            "cruise_speed": 250,
-            "SFC": 0.52,
-            "LD": 19,
-            "fuel_capacity": 101000,
-            "max_takeoff_weight": 254000,
-        },
-        "Airbus A320neo": {
-            "cruise_speed": 230,
-            "SFC": 0.57,
-            "LD": 16,
-            "fuel_capacity": 24210,
-            "max_takeoff_weight": 79000,
-        },
-        "Airbus A350-900": {
-            "cruise_speed": 250,
-            "SFC": 0.50,
-            "LD": 20,
-            "fuel_capacity": 140000,
-            "max_takeoff_weight": 280000,
-        },
-        "Airbus A330-300": {
-            "cruise_speed": 240,
-            "SFC": 0.55,
-            "LD": 18,
-            "fuel_capacity": 97530,
-            "max_takeoff_weight": 242000,
-        },
-        "Embraer E190": {
-            "cruise_speed": 220,
-            "SFC": 0.60,
-            "LD": 14,
-            "fuel_capacity": 13000,
-            "max_takeoff_weight": 51000,
-        },
-        "Bombardier CRJ900": {
-            "cruise_speed": 220,
-            "SFC": 0.62,
-            "LD": 13,
-            "fuel_capacity": 12000,
-            "max_takeoff_weight": 38400,
-        },
-        "Gulfstream G650": {
-            "cruise_speed": 250,
-            "SFC": 0.54,
-            "LD": 18,
-            "fuel_capacity": 18300,
-            "max_takeoff_weight": 45000,
-        },
-        "Cessna Citation X": {
-            "cruise_speed": 260,
-            "SFC": 0.65,
-            "LD": 15,
-            "fuel_capacity": 5600,
-            "max_takeoff_weight": 16000,
-        },
-        "F-16 Fighting Falcon": {
-            "cruise_speed": 270,
-            "SFC": 1.2,
-            "LD": 6,
-            "fuel_capacity": 3000,
-            "max_takeoff_weight": 12000,
-        },
-        "C-130 Hercules": {
-            "cruise_speed": 180,
-            "SFC": 0.75,
-            "LD": 11,
-            "fuel_capacity": 19000,
-            "max_takeoff_weight": 70300,
-        },
-    }
-
     # --- Inputs ---
     col1, col2 = st.columns(2)
     with col1:
@@ -157,15 +137,26 @@ def render():
     with col2:
         destination_city = st.text_input("Destination City", value="Los Angeles")
 
+    wind_grid = get_wind_grid()
+    if wind_grid is not None:
+        cruise_alt_ft = st.slider("Cruise Altitude (ft)", 20000, 43000, 35000, step=1000)
+    else:
+        st.caption("No winds aloft grid found; flight times assume 85% of cruise speed.")
+
     if not (departure_city and destination_city):
         st.info("Enter both a departure and destination city to begin.")
         return
 
     try:
-        with st.spinner("Geocoding cities..."):
-            coords_1 = geocode_city(departure_city)
-            time.sleep(0.3)
-            coords_2 = geocode_city(destination_city)
+        with st.spinner("Looking up cities and weather..."):
+            # resolved here on the script thread, not inside the coroutines
+            index, cache = get_airport_index(), get_geocode_cache()
+            dep, arr = http_client.run(lookup_route(departure_city, destination_city, index, cache))
+
+        for end in (dep, arr):
+            if end["error"]:
+                st.error(end["error"])
+        coords_1, coords_2 = dep["coords"], arr["coords"]
 
         if not coords_1 or not coords_2:
             st.error("❌ Could not locate one or both cities. Try more specific names.")
@@ -173,57 +164,37 @@ def render():
 
         # Great-circle distance
         distance_km = geodesic(coords_1, coords_2).kilometers
-        distance_m = distance_km * 1000.0
-
-        # --- Evaluate each aircraft ---
-        output_rows = []
-        for name, ac in aircraft_data.items():
-            V = ac["cruise_speed"]        # m/s
-            c = ac["SFC"]                 # 1/hr
-            LD = ac["LD"]
-            fuel_capacity = ac["fuel_capacity"]     # kg
-            MTOW = ac["max_takeoff_weight"]         # kg (approx)
-            c_sec = c / 3600.0
-
-            try:
-                # Max range using Breguet with MTOW and MTOW - fuel_capacity
-                R_max_m = (V / c_sec) * LD * math.log(
-                    MTOW / (MTOW - fuel_capacity)
-                )
 
-                if distance_m <= R_max_m:
-                    # Fuel needed for this specific distance
-                    Wf = MTOW / math.exp((c_sec * distance_m) / (V * LD))
-                    fuel_needed = MTOW - Wf
-
-                    # Effective cruise ~ 85% of nominal cruise
-                    effective_speed_ms = V * 0.85
-                    time_hr = distance_km * 1000.0 / effective_speed_ms / 3600.0
-
-                    output_rows.append(
-                        {
-                            "Aircraft": name,
-                            "Flight Time (hr)": round(time_hr, 2),
-                            "Fuel Needed (kg)": round(fuel_needed, 1),
-                        }
-                    )
-            except (ValueError, ZeroDivisionError):
-                continue
-
-        if not output_rows:
+        # --- Evaluate the whole fleet in one vectorized pass ---
+        wind_result = None
+        if wind_grid is not None:
+            wind_result = evaluate_routes_with_wind(
+                [coords_1[0]], [coords_1[1]], [coords_2[0]], [coords_2[1]], wind_grid,
+                cruise_altitude_m=cruise_alt_ft * 0.3048, distances_km=[distance_km],
+            )
+        df_results = evaluate_route(distance_km, result=wind_result)
+
+        if df_results.empty:
             st.warning("❌ No aircraft in the database can complete this journey.")
             return
 
-        df_results = pd.DataFrame(output_rows)
         avg_time = df_results["Flight Time (hr)"].mean()
 
         # --- Summary ---
         st.markdown("### ✈️ Route Summary")
-        colA, colB = st.columns(2)
+        colA, colB, colC = st.columns(3)
         with colA:
             st.metric("📏 Route Distance", f"{distance_km:.1f} km")
         with colB:
             st.metric("⏱ Average Flight Time", f"{avg_time:.2f} hr")
+        with colC:
+            if wind_result is not None:
+                wind = wind_result["wind_component_ms"][0]
+                st.metric(
+                    "💨 Mean Wind Component",
+                    f"{abs(wind):.1f} m/s {'tail' if wind >= 0 else 'head'}",
+                    help=f"Winds aloft grid valid {wind_grid.valid_time}",
+                )
 
         st.subheader(
             f"{departure_city} → {destination_city} "
@@ -238,8 +209,10 @@ def render():
         # --- Weather at departure and destination ---
         st.subheader("🌦 Weather at Departure & Destination")
 
-        dep_weather = get_weather(*coords_1)
-        arr_weather = get_weather(*coords_2)
+        for end in (dep, arr):
+            if end["warning"]:
+                st.warning(end["warning"])
+        dep_weather, arr_weather = dep["weather"], arr["weather"]
 
         colW1, colW2 = st.columns(2)
 
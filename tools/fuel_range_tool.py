@@ -1,6 +1,8 @@
 import math
+import pandas as pd
 import streamlit as st
-import requests
+import http_client
+import dispersion
 
 from config import BACKEND_URL
 
@@ -14,6 +16,7 @@ def render():
 
     # --- Unit system selector ---
     unit_system = st.radio("Select unit system", ["SI (Metric)", "Imperial (English)"])
+    mode = st.radio("Analysis", ["Deterministic", "Monte Carlo dispersion"], horizontal=True)
 
     # --- USER INPUTS ---
     if unit_system == "SI (Metric)":
@@ -78,6 +81,25 @@ def render():
         )
         return
 
+    if mode != "Deterministic":
+        render_monte_carlo(
+            unit_system,
+            {
+                "V_ms": V,
+                "pax": int(pax),
+                "pax_wt_kg": pax_wt,
+                "W_empty_kg": W_empty,
+                "W_fuel_kg": W_fuel,
+                "c_per_hr": c,
+                "LD": LD,
+                "S_m2": S,
+                "b_m": b,
+                "CD0": CD0,
+                "e": e,
+            },
+        )
+        return
+
     # --- Call backend for Breguet + drag math ---
     if st.button("Compute Fuel & Range"):
         payload = {
@@ -96,10 +118,10 @@ def render():
 
         try:
             with st.spinner("Querying ISA backend for fuel & range..."):
-                resp = requests.post(
+                resp = http_client.post(
                     f"{BACKEND_URL}/api/fuel-range/estimate",
+                    endpoint="backend",
                     json=payload,
-                    timeout=10,
                 )
                 resp.raise_for_status()
                 data = resp.json()
@@ -157,3 +179,70 @@ def render():
                 if t_hr is not None and t_min is not None
                 else "—",
             )
+
+
+# -------------------------
+# Monte Carlo mode
+# -------------------------
+# inputs that get a dispersion, with their default 1-sigma in percent
+UNCERTAIN_INPUTS = {
+    "c_per_hr": ("SFC", 5.0),
+    "LD": ("L/D", 3.0),
+    "V_ms": ("Cruise speed", 2.0),
+    "W_fuel_kg": ("Fuel weight", 1.0),
+    "pax_wt_kg": ("Passenger weight", 10.0),
+    "CD0": ("CD₀", 5.0),
+}
+
+
+def render_monte_carlo(unit_system: str, nominal: dict):
+    st.markdown("#### Input uncertainty (1σ, % of nominal, normal)")
+    specs = dict(nominal)
+    cols = st.columns(3)
+    for i, (key, (label, default)) in enumerate(UNCERTAIN_INPUTS.items()):
+        with cols[i % 3]:
+            sigma = st.number_input(f"{label} σ (%)", min_value=0.0, max_value=50.0, value=default)
+        if sigma > 0:
+            specs[key] = ("normal", nominal[key], nominal[key] * sigma / 100.0)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        n_samples = st.number_input(
+            "Samples", min_value=10_000, max_value=50_000_000, value=1_000_000, step=100_000
+        )
+    with col2:
+        seed = st.number_input("Random seed", min_value=0, value=42, step=1)
+
+    if not st.button("Run Monte Carlo"):
+        return
+
+    imperial = unit_system == "Imperial (English)"
+    progress = st.progress(0.0)
+    table = st.empty()
+
+    summary = None
+    for summary in dispersion.run_streaming(specs, int(n_samples), seed=int(seed)):
+        progress.progress(summary["samples"] / n_samples, text=f"{summary['samples']:,} samples")
+        table.dataframe(_percentile_table(summary, imperial), use_container_width=True)
+
+    invalid = summary["range_km"]["invalid"]
+    if invalid:
+        st.warning(
+            f"{invalid:,} samples ({invalid / summary['samples']:.1%}) drew a non-positive speed, "
+            "SFC or L/D, a negative CD₀ or an invalid weight combination, and were left out of the percentiles. "
+            "Reduce the σ values if this share is large."
+        )
+    st.caption(
+        f"{summary['samples']:,} samples, seed {int(seed)}. The same seed and "
+        "sample count always reproduce these percentiles."
+    )
+
+
+def _percentile_table(summary: dict, imperial: bool) -> pd.DataFrame:
+    range_scale, range_unit = (0.621371, "mi") if imperial else (1.0, "km")
+    rows = {
+        f"Range ({range_unit})": {k: v * range_scale for k, v in summary["range_km"].items() if k != "invalid"},
+        "Endurance (hr)": {k: v for k, v in summary["endurance_hr"].items() if k != "invalid"},
+        "Fuel burn time (hr)": {k: v for k, v in summary["fuel_burn_time_hr"].items() if k != "invalid"},
+    }
+    return pd.DataFrame(rows).T.round(2)
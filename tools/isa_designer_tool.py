@@ -1,7 +1,19 @@
 # streamlit_designer.py
 import streamlit as st
 import streamlit.components.v1 as components
-import json
+import io
+import os
+
+import pandas as pd
+
+import design_study
+
+
+designer_preview = components.declare_component(
+    "isa_designer_preview",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "designer_preview"),
+)
+
 
 def run():
     st.set_page_config(layout="wide")
@@ -23,7 +35,7 @@ def run():
         st.markdown("---")
         st.caption("Change inputs to update the 3D preview. Use mouse to orbit and scroll to zoom.")
 
-    # package params for the embedded HTML (convert ft to meters for visualization scale if desired)
+    # params pushed to the 3D preview (1 scene unit = 1 ft)
     params = {
         "S": wing_area,
         "b": wing_span,
@@ -34,198 +46,96 @@ def run():
         "color_wing": color_wing,
         "color_fuse": color_fuse,
     }
-    params_json = json.dumps(params)
 
-    # --- Right column: 3D scene (Three.js inside HTML) ---
+    # --- Right column: 3D scene ---
+    # The preview is a custom component with a fixed key: the iframe, the
+    # Three.js import and the WebGL context are created once, and each rerun
+    # only posts `params` to it (see designer_preview/index.html). The
+    # component returns the camera position when the user stops orbiting.
     with right:
         st.header("3D Preview")
-        DESIGNER_HTML = f"""
-        <!doctype html>
-        <html>
-          <head>
-            <meta charset="utf-8" />
-            <style>
-              html,body {{ margin:0; padding:0; height:100%; background:#070A12; }}
-              #canvas-holder {{ width:100%; height:900px; display:block; }}
-              .infoBox {{
-                position:absolute; left:12px; top:12px; z-index:10;
-                color:#dbeafe; font-family: Arial, sans-serif;
-                background: rgba(2,6,23,0.45); padding:8px 10px; border-radius:8px;
-                border:1px solid rgba(148,163,184,0.06);
-              }}
-            </style>
-          </head>
-          <body>
-            <div class="infoBox">Drag to rotate • Scroll to zoom • Double-click to reset</div>
-            <div id="canvas-holder"></div>
-
-            <script type="module">
-              // params injected by Streamlit
-              const params = {params_json};
-
-              import * as THREE from 'https://unpkg.com/three@0.152.2/build/three.module.js';
-              import {{ OrbitControls }} from 'https://unpkg.com/three@0.152.2/examples/jsm/controls/OrbitControls.js';
-
-              // sizing and scale: we will treat 1 unit = 1 ft for display convenience
-              const container = document.getElementById('canvas-holder');
-              const width = container.clientWidth || window.innerWidth * 0.66;
-              const height = 900;
-
-              const renderer = new THREE.WebGLRenderer({ antialias:true, alpha: true });
-              renderer.setPixelRatio(window.devicePixelRatio || 1);
-              renderer.setSize(width, height);
-              renderer.setClearColor(0x070A12, 1);
-              container.appendChild(renderer.domElement);
-
-              const scene = new THREE.Scene();
-
-              // camera
-              const camera = new THREE.PerspectiveCamera(45, width / height, 0.1, 5000);
-              camera.position.set( -params.b * 0.8, params.fuselage_length * 0.6, params.b * 0.9);
-              camera.lookAt(0,0,0);
-
-              // lights
-              const hemi = new THREE.HemisphereLight(0xffffff, 0x111122, 0.6);
-              scene.add(hemi);
-              const dir = new THREE.DirectionalLight(0xffffff, 0.9);
-              dir.position.set(50,100,30);
-              scene.add(dir);
-
-              // ground grid (subtle)
-              const grid = new THREE.GridHelper(200, 40, 0x0b1220, 0x081018);
-              grid.position.y = -5;
-              scene.add(grid);
-
-              // helper group
-              const aircraft = new THREE.Group();
-              scene.add(aircraft);
-
-              function buildAircraft(p) {{
-                // clear previous
-                while (aircraft.children.length) aircraft.remove(aircraft.children[0]);
-
-                const b = Math.max(0.01, Number(p.b)); // span in ft
-                const S = Math.max(0.01, Number(p.S)); // area ft^2
-                const taper = Math.max(0.01, Math.min(2, Number(p.taper)));
-                const span = b;
-                // estimate mean chord from area = S = span * mean_chord
-                const meanChord = S / span;
-                const rootChord = (2*meanChord) / (1 + taper);
-                const tipChord = rootChord * taper;
-
-                // wing: approximate as two trapezoidal plates (left & right) using BoxGeometry scaled
-                const halfSpan = span / 2;
-                // left wing
-                const leftGeom = new THREE.BoxGeometry(halfSpan, 0.2, rootChord);
-                // shift origin to root edge for nicer transform
-                leftGeom.translate(-halfSpan/2, 0, 0);
-                const wingMat = new THREE.MeshStandardMaterial({{ color: p.color_wing, metalness:0.2, roughness:0.5, opacity:0.98 }});
-                const leftWing = new THREE.Mesh(leftGeom, wingMat);
-                leftWing.rotation.x = 0;
-                leftWing.position.set(-halfSpan/2, 0, 0); // small offset
-                // scale Z to approximate taper (rough)
-                leftWing.scale.z = rootChord;
-                // rotate to give slight dihedral
-                leftWing.rotation.z = Math.PI * 0.005;
-
-                // right wing (mirror)
-                const rightGeom = new THREE.BoxGeometry(halfSpan, 0.2, rootChord);
-                rightGeom.translate(halfSpan/2, 0, 0);
-                const rightWing = new THREE.Mesh(rightGeom, wingMat);
-                rightWing.position.set(halfSpan/2, 0, 0);
-                rightWing.scale.z = rootChord;
-                rightWing.rotation.z = -Math.PI * 0.005;
-
-                // Fuselage (cylinder)
-                const fusel = new THREE.CylinderGeometry(p.fuselage_dia/2, p.fuselage_dia/2, p.fuselage_length, 24);
-                const fusemat = new THREE.MeshStandardMaterial({{ color: p.color_fuse, metalness:0.25, roughness:0.4 }});
-                const fusemesh = new THREE.Mesh(fusel, fusemat);
-                fusemesh.rotation.z = Math.PI/2;
-                fusemesh.position.set(0, 0, 0);
-
-                // Simple tail - horizontal and vertical
-                const tailH = new THREE.BoxGeometry(p.fuselage_length*0.25, 0.08, meanChord*0.6);
-                const tailHmesh = new THREE.Mesh(tailH, wingMat);
-                tailHmesh.position.set(-p.fuselage_length*0.45, 0.0, 0.0);
-
-                const tailV = new THREE.BoxGeometry(0.08, p.fuselage_length*0.18, meanChord*0.3);
-                const tailVmesh = new THREE.Mesh(tailV, wingMat);
-                tailVmesh.position.set(-p.fuselage_length*0.5, 0.08, 0);
-
-                // assemble
-                aircraft.add(leftWing);
-                aircraft.add(rightWing);
-                aircraft.add(fusemesh);
-                aircraft.add(tailHmesh);
-                aircraft.add(tailVmesh);
-
-                // bounding box helper (optional)
-                const bbox = new THREE.BoxHelper(aircraft, 0x223344);
-                aircraft.add(bbox);
-
-                // center aircraft at origin
-                aircraft.position.y = 0;
-              }}
-
-              // initial build
-              buildAircraft(params);
-
-              // orbit controls
-              const controls = new OrbitControls(camera, renderer.domElement);
-              controls.enableDamping = true;
-              controls.dampingFactor = 0.07;
-              controls.screenSpacePanning = false;
-
-              const clock = new THREE.Clock();
-
-              function animate() {{
-                requestAnimationFrame(animate);
-                const dt = clock.getDelta();
-                controls.update();
-                renderer.render(scene, camera);
-              }}
-              animate();
-
-              // expose a small API for Streamlit to call by re-creating the scene when params change
-              window.updateAircraft = function(newParams) {{
-                // merge numeric values
-                try {{
-                  const p = Object.assign({{}}, params, newParams);
-                  // coerce numbers
-                  p.b = parseFloat(p.b);
-                  p.S = parseFloat(p.S);
-                  p.taper = parseFloat(p.taper);
-                  p.fuselage_length = parseFloat(p.fuselage_length);
-                  p.fuselage_dia = parseFloat(p.fuselage_dia);
-                  // rebuild
-                  buildAircraft(p);
-                  // adjust camera distance for new span
-                  camera.position.set(-p.b * 0.8, p.fuselage_length * 0.6, p.b * 0.9);
-                }} catch (err) {{
-                  console.warn("update error", err);
-                }}
-              }};
-
-              // auto-resize
-              window.addEventListener('resize', () => {{
-                const w = container.clientWidth;
-                const h = container.clientHeight || 900;
-                renderer.setSize(w, h);
-                camera.aspect = w/h;
-                camera.updateProjectionMatrix();
-              }});
-            </script>
-          </body>
-        </html>
-        """
-
-        # embed the html; set scrolling=True to allow mobile scroll, but height fixed here
-        components.html(DESIGNER_HTML, height=920, scrolling=True)
-
-    # After rendering the component, call JS API to update if Streamlit changes (this uses a hacky JS eval)
-    # Streamlit can't directly call window.updateAircraft inside the iframe, but the HTML already got params at load.
-    # To force a reload with new params we can re-embed; so keep the pattern above simple.
-    # (Alternative: build a custom Streamlit component for two-way comms.)
+        view = designer_preview(
+            params=params,
+            camera=st.session_state.get("designer_camera"),
+            key="designer_preview",
+            default=None,
+        )
+        if view is not None:
+            st.session_state["designer_camera"] = view.get("camera")
+
+    render_trade_study()
+
+
+# -------------------------
+# Trade study
+# -------------------------
+# Runs as a fragment: its widgets only rerun this function, so the 3D
+# preview above is not re-embedded for every study.
+STUDY_AXES = {
+    "mtow_lb": ("MTOW (lb)", 30.0, 120.0),
+    "wing_span_ft": ("Wing span (ft)", 8.0, 30.0),
+    "wing_area_ft2": ("Wing area (ft²)", 10.0, 60.0),
+    "cruise_speed_kt": ("Cruise speed (kt)", 35.0, 90.0),
+}
+
+
+@st.fragment
+def render_trade_study():
+    st.markdown("---")
+    st.header("Trade Study")
+    st.caption("Latin-hypercube sweep of the designer inputs, evaluated on a process pool.")
+
+    bounds = {}
+    cols = st.columns(len(STUDY_AXES))
+    for col, (key, (label, lo, hi)) in zip(cols, STUDY_AXES.items()):
+        with col:
+            bounds[key] = st.slider(label, lo / 4, hi * 4, (lo, hi))
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        n = st.number_input("Designs", min_value=100, max_value=5_000_000, value=100_000, step=10_000)
+    with c2:
+        seed = st.number_input("Seed", min_value=0, value=0, step=1)
+    with c3:
+        x_obj = st.selectbox("X objective", list(design_study.OBJECTIVES), index=2)
+    with c4:
+        y_obj = st.selectbox("Y objective", list(design_study.OBJECTIVES), index=0)
+    if x_obj == y_obj:
+        st.error("Pick two different objectives for the Pareto front.")
+        return
+
+    if st.button("Run trade study"):
+        with st.spinner("Evaluating designs..."):
+            designs = design_study.latin_hypercube(bounds, int(n), int(seed))
+            st.session_state["designer_study"] = design_study.run_study(designs)
+
+    results = st.session_state.get("designer_study")
+    if results is None:
+        return
+
+    front = design_study.pareto_front(results, [x_obj, y_obj])
+    st.metric("Feasible designs", f"{int(results['feasible'].sum()):,} / {len(results):,}")
+
+    # plot the front plus a bounded sample of the cloud
+    cloud = results[results["feasible"]].sample(min(5000, int(results["feasible"].sum())), random_state=0)
+    plot = pd.concat([
+        cloud.assign(set="design").loc[:, [x_obj, y_obj, "set"]],
+        results[front].assign(set="Pareto front").loc[:, [x_obj, y_obj, "set"]],
+    ])
+    st.scatter_chart(plot, x=x_obj, y=y_obj, color="set")
+
+    st.dataframe(results[front].sort_values(x_obj), use_container_width=True)
+
+    def results_parquet():
+        buf = io.BytesIO()
+        results.assign(pareto=front).to_parquet(buf, index=False)
+        return buf.getvalue()
+
+    # deferred: the file is only written when the button is clicked, not on
+    # every fragment rerun
+    st.download_button("Download results (.parquet)", results_parquet, "design_study.parquet",
+                       mime="application/vnd.apache.parquet")
+
 
 if __name__ == "__main__":
     run()
@@ -1,21 +1,29 @@
 import streamlit as st
-import requests
 from utils import convert_altitude
+import http_client
+import physics
 
 
-from config import BACKEND_URL
+from config import BACKEND_URL, ENGINE_MODE
 
 
 def call_backend_isa(altitude_m: float):
     """
     Call the ISA backend endpoint with altitude in meters.
+    With ENGINE_MODE == "local" the same payload is computed in-process.
     Returns (data_dict, error_message).
     """
+    if ENGINE_MODE == "local":
+        try:
+            return physics.isa_properties(altitude_m), None
+        except ValueError as e:
+            return None, str(e)
+
     try:
-        resp = requests.get(
+        resp = http_client.get(
             f"{BACKEND_URL}/api/isa",
+            endpoint="backend",
             params={"altitude_m": altitude_m},
-            timeout=10,
         )
         resp.raise_for_status()
         return resp.json(), None
@@ -49,7 +57,8 @@ def render():
 
     # For now, backend is implemented for troposphere (0–11 km).
     # You previously allowed up to 47 km; we'll expand the backend later.
-    if alt_m > 11000.0:
+    # The local engine covers the full 0–47 km model.
+    if ENGINE_MODE != "local" and alt_m > 11000.0:
         st.error(
             "Backend ISA model currently supports up to 11,000 m. "
             "Please enter an altitude <= 11 km for now."
@@ -1,21 +1,32 @@
 import math
+import numpy as np
+import pandas as pd
 import streamlit as st
-import requests  # 👈 NEW
-from utils import convert_altitude
+from utils import convert_altitude, isa_atmosphere
+import http_client
+import physics
 
-from config import BACKEND_URL
+from config import BACKEND_URL, ENGINE_MODE
 
 
 def call_backend_isa(altitude_m: float):
     """
     Call ISA backend to get T, P, rho, a for a given altitude in meters.
+    With ENGINE_MODE == "local" the ISA model runs in-process instead.
     Returns (T_K, P_Pa, rho, a) or (None, None, None, None) on error.
     """
+    if ENGINE_MODE == "local":
+        result = isa_atmosphere(altitude_m)
+        if result is None:
+            st.error("Altitude must be between 0 and 47,000 m.")
+            return None, None, None, None
+        return result
+
     try:
-        resp = requests.get(
-        f"{BACKEND_URL}/api/isa",
-        params={"altitude_m": altitude_m},
-        timeout=10,
+        resp = http_client.get(
+            f"{BACKEND_URL}/api/isa",
+            endpoint="backend",
+            params={"altitude_m": altitude_m},
         )
         resp.raise_for_status()
         data = resp.json()
@@ -41,6 +52,10 @@ def render():
 
     # --- Unit system selector ---
     unit_system = st.radio("Select unit system", ["Metric (SI)", "Imperial (English)"])
+    mode = st.radio("Mode", ["Single point", "Sweep (altitude × airspeed)"], horizontal=True)
+    if mode != "Single point":
+        render_sweep(unit_system)
+        return
 
     # --- Altitude input ---
     alt_unit = st.selectbox("Altitude unit", ["meters", "feet", "kilometers"])
@@ -54,7 +69,8 @@ def render():
     alt_m = convert_altitude(user_alt, alt_unit, "meters")
 
     # For now, match backend ISA limit (0–11 km) like other tools
-    if alt_m > 11000.0:
+    # (the local engine covers the full 0–47 km model)
+    if ENGINE_MODE != "local" and alt_m > 11000.0:
         st.error(
             "Backend ISA model currently supports up to 11,000 m (11 km). "
             "Please enter an altitude <= 11 km for now."
@@ -146,3 +162,134 @@ def render():
         st.metric(label="Aspect Ratio (AR)", value=f"{AR:.2f}")
         st.metric(label="Induced Drag Factor (k)", value=f"{k:.5f}")
         st.metric(label="Drag Coefficient (CD)", value=f"{CD:.4f}")
+
+
+# -------------------------
+# Sweep mode
+# -------------------------
+@st.cache_data(max_entries=32, show_spinner=False)
+def sweep_tables(altitudes_m, speeds_ms, weights_N, S, b, CD0, e):
+    """
+    Evaluate the whole altitude x airspeed x weight grid in one vectorized
+    pass (local ISA model, no backend calls) and return it as long-form
+    tables. Cached on the inputs, so Streamlit reruns that only change the
+    display do not recompute.
+    """
+    grid = physics.lift_drag_grid(altitudes_m, speeds_ms, weights_N, S, b, CD0, e)
+
+    h, V, W = np.meshgrid(
+        grid["altitude_m"], grid["speed_m_s"], grid["weight_N"], indexing="ij"
+    )
+    points = pd.DataFrame({
+        "altitude_m": h.ravel(),
+        "speed_m_s": V.ravel(),
+        "weight_N": W.ravel(),
+        "CL": grid["CL"].ravel(),
+        "CD": grid["CD"].ravel(),
+        "drag_N": grid["drag_N"].ravel(),
+        "L_D": grid["L_D"].ravel(),
+        "power_W": grid["power_W"].ravel(),
+    })
+
+    h, W = np.meshgrid(grid["altitude_m"], grid["weight_N"], indexing="ij")
+    optimum = pd.DataFrame({
+        "altitude_m": h.ravel(),
+        "weight_N": W.ravel(),
+        "V_LD_max_m_s": grid["V_LD_max_m_s"].ravel(),
+    })
+    return points, optimum, grid["LD_max"]
+
+
+def render_sweep(unit_system: str):
+    imperial = unit_system == "Imperial (English)"
+
+    # --- Aircraft (same inputs as the single-point mode) ---
+    if imperial:
+        S = st.number_input("Wing area (ft²)", value=175.0) * 0.092903
+        b = st.number_input("Wingspan (ft)", value=36.0) * 0.3048
+    else:
+        S = st.number_input("Wing area (m²)", value=16.2)
+        b = st.number_input("Wingspan (m)", value=10.9)
+    CD0 = st.number_input("Zero-lift drag coefficient (CD₀)", min_value=0.0, value=0.02)
+    e = st.number_input("Oswald efficiency factor (e)", min_value=0.1, max_value=1.0, value=0.8)
+
+    # --- Grid ---
+    st.markdown("#### Sweep grid")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        alt_unit = "feet" if imperial else "meters"
+        alt_lo, alt_hi = st.slider(
+            f"Altitude ({'ft' if imperial else 'm'})",
+            0.0, 154200.0 if imperial else 47000.0,
+            (0.0, 30000.0 if imperial else 9000.0),
+        )
+        n_alt = st.number_input("Altitude steps", min_value=1, max_value=50, value=4)
+    with col2:
+        speed_lo, speed_hi = st.slider(
+            f"Airspeed ({'ft/s' if imperial else 'm/s'})",
+            10.0, 1500.0 if imperial else 450.0,
+            (60.0, 500.0) if imperial else (20.0, 150.0),
+        )
+        n_speed = st.number_input("Airspeed steps", min_value=2, max_value=500, value=100)
+    with col3:
+        if imperial:
+            w_lo, w_hi = st.slider("Weight (lb)", 100.0, 100000.0, (1400.0, 2400.0))
+        else:
+            w_lo, w_hi = st.slider("Mass (kg)", 50.0, 50000.0, (600.0, 1100.0))
+        n_weight = st.number_input("Weight steps", min_value=1, max_value=20, value=3)
+
+    altitudes_m = convert_altitude(1.0, alt_unit, "meters") * np.linspace(alt_lo, alt_hi, int(n_alt))
+    speed_scale = 1 / 3.28084 if imperial else 1.0
+    speeds_ms = speed_scale * np.linspace(speed_lo, speed_hi, int(n_speed))
+    weight_scale = 4.44822 if imperial else 9.81
+    weights_N = weight_scale * np.linspace(w_lo, w_hi, int(n_weight))
+
+    with st.spinner("Evaluating envelope..."):
+        points, optimum, LD_max = sweep_tables(
+            tuple(altitudes_m), tuple(speeds_ms), tuple(weights_N), S, b, CD0, e
+        )
+
+    # --- Display units ---
+    if imperial:
+        points["altitude"] = (points["altitude_m"] / 0.3048).round(0).astype(int).astype(str) + " ft"
+        points["V (ft/s)"] = points["speed_m_s"] * 3.28084
+        points["Drag (lb)"] = points["drag_N"] / 4.44822
+        points["Power required (hp)"] = points["power_W"] / 745.7
+        points["weight"] = (points["weight_N"] / 4.44822).round(0).astype(int).astype(str) + " lb"
+        v_col, d_col, p_col = "V (ft/s)", "Drag (lb)", "Power required (hp)"
+    else:
+        points["altitude"] = points["altitude_m"].round(0).astype(int).astype(str) + " m"
+        points["V (m/s)"] = points["speed_m_s"]
+        points["Drag (N)"] = points["drag_N"]
+        points["Power required (kW)"] = points["power_W"] / 1000.0
+        points["weight"] = (points["weight_N"] / 9.81).round(0).astype(int).astype(str) + " kg"
+        v_col, d_col, p_col = "V (m/s)", "Drag (N)", "Power required (kW)"
+
+    weight_label = st.selectbox("Curves for weight", points["weight"].unique())
+    view = points[points["weight"] == weight_label]
+
+    st.markdown("### 📈 Drag polar")
+    st.line_chart(view, x="CD", y="CL", color="altitude")
+
+    st.markdown("### ⚡ Power required")
+    st.line_chart(view, x=v_col, y=p_col, color="altitude")
+
+    st.markdown("### 🪂 Drag vs airspeed")
+    st.line_chart(view, x=v_col, y=d_col, color="altitude")
+
+    # --- L/D max ---
+    st.markdown("### 🎯 L/D max")
+    st.metric("(L/D)max", f"{LD_max:.2f}" if math.isfinite(LD_max) else "—")
+    table = optimum.copy()
+    if imperial:
+        table["Altitude (ft)"] = table["altitude_m"] / 0.3048
+        table["Weight (lb)"] = table["weight_N"] / 4.44822
+        table["V at L/D max (ft/s)"] = table["V_LD_max_m_s"] * 3.28084
+    else:
+        table["Altitude (m)"] = table["altitude_m"]
+        table["Mass (kg)"] = table["weight_N"] / 9.81
+        table["V at L/D max (m/s)"] = table["V_LD_max_m_s"]
+    st.dataframe(
+        table.drop(columns=["altitude_m", "weight_N", "V_LD_max_m_s"]).round(1),
+        use_container_width=True,
+    )
@@ -1,8 +1,38 @@
 import streamlit as st
-import requests
 from utils import convert_altitude
+import http_client
+import physics
 
-from config import BACKEND_URL
+from config import BACKEND_URL, ENGINE_MODE
+
+
+def call_backend_mach(altitude_m: float, speed_value: float, speed_unit: str):
+    """
+    Call the Mach backend endpoint (or the local engine when
+    ENGINE_MODE == "local"). Returns (data_dict, error_message).
+    """
+    if ENGINE_MODE == "local":
+        try:
+            return physics.mach_properties(altitude_m, speed_value, speed_unit), None
+        except ValueError as e:
+            return None, str(e)
+
+    payload = {
+        "altitude_m": altitude_m,      # 👈 this is what backend expects
+        "speed_value": speed_value,
+        "speed_unit": speed_unit,
+    }
+
+    try:
+        resp = http_client.post(
+            f"{BACKEND_URL}/api/mach/compute",
+            endpoint="backend",
+            json=payload,
+        )
+        resp.raise_for_status()
+        return resp.json(), None
+    except Exception as e:
+        return None, str(e)
 
 
 def render():
@@ -34,8 +64,8 @@ def render():
     # Convert altitude to meters for backend
     alt_m = convert_altitude(user_alt, alt_unit, "meters")
 
-    # Backend Mach model is limited to 0–11 km
-    if alt_m > 11000.0:
+    # Backend Mach model is limited to 0–11 km (local engine: 0–47 km)
+    if ENGINE_MODE != "local" and alt_m > 11000.0:
         st.error(
             "Backend Mach model currently supports up to 11,000 m (11 km). "
             "Please enter an altitude <= 11 km for now."
@@ -44,23 +74,11 @@ def render():
 
     # --- Backend call ---
     if st.button("Calculate Mach Number"):
-        payload = {
-            "altitude_m": alt_m,      # 👈 this is what backend expects
-            "speed_value": V_input,
-            "speed_unit": speed_unit,
-        }
+        with st.spinner("Querying ISA backend for Mach..."):
+            data, error = call_backend_mach(alt_m, V_input, speed_unit)
 
-        try:
-            with st.spinner("Querying ISA backend for Mach..."):
-                resp = requests.post(
-                    f"{BACKEND_URL}/api/mach/compute",
-                    json=payload,
-                    timeout=10,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-        except Exception as e:
-            st.error(f"Error calling Mach backend: {e}")
+        if error:
+            st.error(f"Error calling Mach backend: {error}")
             return
 
         # --- Unpack backend result ---
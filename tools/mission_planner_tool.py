@@ -1,6 +1,9 @@
 import math
+import numpy as np
+import pandas as pd
 import streamlit as st
-import requests
+import http_client
+import mission
 
 from config import BACKEND_URL
 
@@ -14,6 +17,11 @@ def render():
 
     # --- Unit system selector ---
     unit_system = st.radio("Select unit system", ["SI (Metric)", "Imperial (English)"])
+    mode = st.radio(
+        "Mission model",
+        ["Breguet (single cruise)", "Segmented (climb / cruise / descent / reserve)"],
+        horizontal=True,
+    )
 
     # --- Unit conversion helpers ---
     def to_kg(lb: float) -> float:
@@ -66,6 +74,10 @@ def render():
         )
         return
 
+    if mode != "Breguet (single cruise)":
+        render_segmented(Wi, fuel_weight, cruise_speed, c, LD, unit_system)
+        return
+
     # --- Call backend ---
     if st.button("Compute Mission Performance"):
         payload = {
@@ -78,10 +90,10 @@ def render():
 
         try:
             with st.spinner("Querying backend for mission estimate..."):
-                resp = requests.post(
+                resp = http_client.post(
                     f"{BACKEND_URL}/api/mission-planner/estimate",
+                    endpoint="backend",
                     json=payload,
-                    timeout=10,
                 )
                 resp.raise_for_status()
                 data = resp.json()
@@ -119,3 +131,61 @@ def render():
                     st.metric("Range", f"{R_mi:.1f} mi / {R_nm:.1f} nmi")
                 else:
                     st.metric("Range", "—")
+
+
+def render_segmented(Wi, fuel_weight, cruise_speed, c, LD, unit_system):
+    """Segment-wise mission flown by the local integrator (mission.py)."""
+    imperial = unit_system != "SI (Metric)"
+    dist_unit = "nmi" if imperial else "km"
+    alt_unit = "ft" if imperial else "m"
+    alt_scale = 0.3048 if imperial else 1.0
+
+    col1, col2 = st.columns(2)
+    with col1:
+        distance = st.number_input(f"Cruise distance ({dist_unit})", value=1500.0 if imperial else 2800.0, min_value=1.0)
+        cruise_alt = st.number_input(f"Initial cruise altitude ({alt_unit})", value=33000.0 if imperial else 10000.0, min_value=0.0)
+        step_alt = st.number_input(f"Step-climb altitude ({alt_unit}, 0 = none)", value=0.0, min_value=0.0)
+    with col2:
+        reserve_min = st.number_input("Reserve (min)", value=45.0, min_value=0.0)
+        sfc_slope = st.number_input(
+            "SFC weight sensitivity (ΔSFC/SFC per ΔW/W)", value=0.0,
+            help="0 uses the closed-form Breguet segments; anything else time-steps the fuel burn.",
+        )
+
+    distance_km = distance * (1.852 if imperial else 1.0)
+    plan = mission.standard_mission(
+        distance_km,
+        cruise_altitude_m=cruise_alt * alt_scale,
+        step_altitude_m=step_alt * alt_scale if step_alt > 0 else None,
+        cruise_speed_ms=cruise_speed,
+        LD=LD,
+        reserve_min=reserve_min,
+    )
+    sfc = c if sfc_slope == 0 else mission.linear_sfc(c, sfc_slope, Wi)
+    result = plan.run(Wi, sfc)
+
+    fuel_used = float(result["fuel_kg"][0])
+    mass_scale = 1 / 0.453592 if imperial else 1.0
+    mass_unit = "lb" if imperial else "kg"
+
+    st.markdown("### 📊 Segmented Mission")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Mission Fuel", f"{fuel_used * mass_scale:,.0f} {mass_unit}")
+        st.metric("Block Time", f"{result['time_hr'][0]:.2f} hr")
+    with col2:
+        ground_km = float(result["distance_km"][0])
+        st.metric("Ground Distance", f"{ground_km / (1.852 if imperial else 1.0):,.0f} {dist_unit}")
+        margin = fuel_weight - fuel_used
+        st.metric("Fuel Margin", f"{margin * mass_scale:,.0f} {mass_unit}")
+    if margin < 0:
+        st.error("Not enough fuel for this mission including reserve.")
+
+    st.dataframe(
+        pd.DataFrame({
+            "Segment": result["segments"],
+            f"Fuel ({mass_unit})": np.round(result["fuel_by_segment_kg"][:, 0] * mass_scale, 1),
+            "Time (hr)": np.round(result["time_by_segment_hr"][:, 0], 2),
+        }),
+        use_container_width=True,
+    )
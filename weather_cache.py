@@ -0,0 +1,159 @@
+# weather_cache.py
+"""
+Open-Meteo snapshot cache shared by the city-to-city tool and the backend
+weather endpoints (which index.html uses).
+
+Requests are snapped to a lat/lon grid cell (CELL_DEG) and keyed on the
+cell plus a time bucket per kind of data (current conditions every 15 min,
+hourly winds every hour), so every caller inside one cell and bucket shares
+a single upstream call.
+
+Stale-while-revalidate: once the bucket rolls over, the previous snapshot is
+still served (up to MAX_STALE_S) while one background refresh runs; if
+Open-Meteo is slow or down, callers keep getting the last snapshot instead
+of waiting. Concurrent misses on the same key share one in-flight request.
+
+All coroutines run on the http_client event loop (http_client.run from sync
+code, http_client.submit from another loop), so the cache needs no locks.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+
+import http_client
+
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CELL_DEG = 0.1            # ~11 km; far below the model's own resolution
+MAX_STALE_S = 3 * 3600
+MAX_ENTRIES = 4096
+
+# kind -> (bucket seconds, upstream query without lat/lon)
+KINDS = {
+    "current": (900, {"current_weather": "true"}),
+    "surface": (900, {
+        "current": "temperature_2m,relative_humidity_2m,pressure_msl,wind_speed_10m,wind_direction_10m",
+        "hourly": "temperature_2m,wind_speed_10m,wind_direction_10m,precipitation",
+        "forecast_days": 1,
+        "timezone": "auto",
+    }),
+    "winds_aloft": (3600, {
+        "hourly": "windspeed_{level}hPa,winddirection_{level}hPa",
+        "forecast_days": 1,
+        "timezone": "auto",
+    }),
+}
+PRESSURE_LEVELS = (1000, 925, 850, 700, 600, 500, 400, 300, 250, 200, 150, 100)
+
+
+def grid_cell(lat: float, lon: float, cell_deg: float = CELL_DEG):
+    """Centre of the grid cell containing (lat, lon)."""
+    def snap(x):
+        # round first so 33.8 / 0.1 = 337.99999... lands in cell 338
+        return round((math.floor(round(x / cell_deg, 9)) + 0.5) * cell_deg, 6)
+    return snap(lat), snap(((lon + 180.0) % 360.0) - 180.0)
+
+
+class WeatherCache:
+    def __init__(self, cell_deg: float = CELL_DEG, max_stale_s: float = MAX_STALE_S,
+                 max_entries: int = MAX_ENTRIES):
+        self.cell_deg = cell_deg
+        self.max_stale_s = max_stale_s
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+
+        self._entries = OrderedDict()   # key -> (data, bucket, fetched_at)
+        self._inflight = {}             # key -> asyncio.Task
+
+    def _query(self, kind: str, lat: float, lon: float, level):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown weather kind '{kind}'. Use one of {sorted(KINDS)}.")
+        if kind == "winds_aloft" and level not in PRESSURE_LEVELS:
+            raise ValueError(f"Pressure level must be one of {PRESSURE_LEVELS} hPa.")
+
+        bucket_s, template = KINDS[kind]
+        params = {k: v.format(level=level) if isinstance(v, str) else v for k, v in template.items()}
+        params["latitude"], params["longitude"] = lat, lon
+        return bucket_s, params
+
+    async def get(self, kind: str, lat: float, lon: float, level: int = None):
+        """
+        Open-Meteo JSON for the grid cell of (lat, lon).
+        Returns (data, status) with status "hit", "stale" or "miss".
+        Raises ValueError for bad arguments and the upstream error when
+        there is nothing cached to fall back on.
+        """
+        cell = grid_cell(lat, lon, self.cell_deg)
+        bucket_s, params = self._query(kind, *cell, level)
+        key = (kind, cell, level)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            data, bucket, fetched_at = entry
+            self._entries.move_to_end(key)
+            if bucket == int(now // bucket_s):
+                self.hits += 1
+                return data, "hit"
+            if now - fetched_at <= self.max_stale_s:
+                self.stale_hits += 1
+                self._refresh(key, bucket_s, params)
+                return data, "stale"
+
+        self.misses += 1
+        return await asyncio.shield(self._refresh(key, bucket_s, params)), "miss"
+
+    def _refresh(self, key, bucket_s: int, params: dict) -> asyncio.Task:
+        """Start (or join) the single upstream fetch for `key`."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._fetch(key, bucket_s, params))
+            task.add_done_callback(lambda t: (self._inflight.pop(key, None), t.exception()))
+        return task
+
+    async def _fetch(self, key, bucket_s: int, params: dict):
+        self.upstream_calls += 1
+        try:
+            r = await http_client.aget(FORECAST_URL, endpoint="weather", params=params)
+            r.raise_for_status()
+            data = r.json()
+        except Exception:
+            self.upstream_errors += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]   # keep serving the old snapshot
+            raise
+
+        now = time.time()
+        self._entries[key] = (data, int(now // bucket_s), now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return data
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "entries": len(self._entries),
+        }
+
+
+_default = None
+
+
+def get_weather_cache() -> WeatherCache:
+    """Process-wide cache (one per Streamlit or backend worker process)."""
+    global _default
+    if _default is None:
+        _default = WeatherCache()
+    return _default